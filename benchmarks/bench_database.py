@@ -0,0 +1,146 @@
+"""
+Compare get_event/join_event throughput with a connection per call against
+the shared connection pool.
+
+The per-call path opens, uses and closes its own sqlite3 connection for every
+operation, as Database did before the pool. Each path gets its own database
+file with the current schema.
+
+Usage: python benchmarks/bench_database.py [ops]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import EVENT_COLUMNS, MIGRATIONS, Database, close_pools  # noqa: E402
+
+EVENT_ID = "1"
+GUILD_ID = "100"
+
+
+def create_schema(db_file: str):
+    """Create the current schema without the pool, in rollback journal mode"""
+    conn = sqlite3.connect(db_file)
+    c = conn.cursor()
+    for migrate in MIGRATIONS:
+        migrate(c)
+    c.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+    conn.commit()
+    conn.close()
+
+
+def add_event(db: Database):
+    db.add_event(
+        EVENT_ID,
+        GUILD_ID,
+        "Benchmark CTF",
+        "2099-01-01T00:00:00+00:00",
+        "2099-01-02T00:00:00+00:00",
+        "Jeopardy",
+        0,
+        "",
+        "",
+        "",
+        "bench",
+    )
+
+
+def get_event_per_call(db_file: str, event_id: str, guild_id: str):
+    conn = sqlite3.connect(db_file)
+    try:
+        c = conn.cursor()
+        c.execute(
+            f"SELECT {EVENT_COLUMNS} FROM ctf_events e WHERE event_id = ? AND guild_id = ?",
+            (event_id, guild_id),
+        )
+        return c.fetchone()
+    finally:
+        conn.close()
+
+
+def join_event_per_call(db_file: str, event_id: str, guild_id: str, user_id: str):
+    conn = sqlite3.connect(db_file)
+    try:
+        c = conn.cursor()
+        c.execute(
+            "SELECT 1 FROM ctf_events WHERE event_id = ? AND guild_id = ?",
+            (event_id, guild_id),
+        )
+        if not c.fetchone():
+            return False
+        c.execute(
+            "SELECT 1 FROM event_participants WHERE event_id = ? AND guild_id = ? AND user_id = ?",
+            (event_id, guild_id, user_id),
+        )
+        if c.fetchone():
+            return True
+        c.execute(
+            "INSERT INTO event_participants (event_id, guild_id, user_id, join_time) VALUES (?, ?, ?, ?)",
+            (event_id, guild_id, user_id, datetime.now().isoformat()),
+        )
+        conn.commit()
+        return True
+    finally:
+        conn.close()
+
+
+def ops_per_second(operation, ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        operation(i)
+    return ops / (time.perf_counter() - start)
+
+
+def main():
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        per_call_file = os.path.join(tmpdir, "per_call.db")
+        create_schema(per_call_file)
+        db = Database(os.path.join(tmpdir, "pooled.db"))
+        add_event(db)
+        # Same row in the per-call database, written without the pool
+        conn = sqlite3.connect(per_call_file)
+        conn.execute(
+            "ATTACH DATABASE ? AS pooled", (os.path.join(tmpdir, "pooled.db"),)
+        )
+        conn.execute("INSERT INTO ctf_events SELECT * FROM pooled.ctf_events")
+        conn.commit()
+        conn.close()
+
+        results = {
+            "get_event": (
+                ops_per_second(
+                    lambda i: get_event_per_call(per_call_file, EVENT_ID, GUILD_ID),
+                    ops,
+                ),
+                ops_per_second(lambda i: db.get_event(EVENT_ID, GUILD_ID), ops),
+            ),
+            "join_event": (
+                ops_per_second(
+                    lambda i: join_event_per_call(
+                        per_call_file, EVENT_ID, GUILD_ID, str(i)
+                    ),
+                    ops,
+                ),
+                ops_per_second(lambda i: db.join_event(EVENT_ID, GUILD_ID, str(i)), ops),
+            ),
+        }
+        close_pools()
+
+    print(f"{ops} ops per operation")
+    print(f"{'operation':<12}{'per call':>14}{'pooled':>14}{'speedup':>10}")
+    for name, (per_call, pooled) in results.items():
+        print(
+            f"{name:<12}{per_call:>10.0f} op/s{pooled:>10.0f} op/s{pooled / per_call:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
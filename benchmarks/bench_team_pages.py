@@ -0,0 +1,80 @@
+"""
+Compare team page parse time and peak memory between the lxml fast path and
+the html.parser fallback, over the saved team page fixtures.
+
+The lxml path cuts out the events table and parses only that; the fallback
+parses the full page with BeautifulSoup. tracemalloc only sees Python
+allocations, so memory held inside libxml2 is not part of the lxml peak.
+
+Usage: python benchmarks/bench_team_pages.py [repeats]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ctftime_api import (  # noqa: E402
+    _parse_team_events_lxml,
+    _parse_team_events_soup,
+    _table_section,
+    lxml_html,
+)
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures", "team_pages")
+
+
+def parse_lxml(html: str):
+    return _parse_team_events_lxml(_table_section(html))
+
+
+def parse_soup(html: str):
+    return _parse_team_events_soup(html)
+
+
+def mean_ms(parse, html: str, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        parse(html)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def peak_kib(parse, html: str) -> float:
+    tracemalloc.start()
+    try:
+        parse(html)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    if lxml_html is None:
+        sys.exit("lxml is not installed")
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"mean of {repeats} parses, peak from one parse under tracemalloc")
+    print(
+        f"{'fixture':<20}{'size':>9}{'lxml':>10}{'fallback':>11}{'speedup':>9}"
+        f"{'lxml peak':>12}{'fallback peak':>15}"
+    )
+    for name in sorted(os.listdir(FIXTURES)):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            html = f.read()
+        if parse_lxml(html) != parse_soup(html):
+            sys.exit(f"{name}: lxml and fallback results differ")
+
+        lxml_ms = mean_ms(parse_lxml, html, repeats)
+        soup_ms = mean_ms(parse_soup, html, repeats)
+        print(
+            f"{name:<20}{len(html) / 1024:>6.0f} KiB{lxml_ms:>7.2f} ms{soup_ms:>8.2f} ms"
+            f"{soup_ms / lxml_ms:>8.1f}x{peak_kib(parse_lxml, html):>8.0f} KiB"
+            f"{peak_kib(parse_soup, html):>11.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
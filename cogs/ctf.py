@@ -2,137 +2,29 @@
 CTF competition management commands.
 """
 
+import asyncio
+import time
 from datetime import datetime
 
 import discord
 import pytz
 from discord.ext import commands, tasks
 
-from ctftime_api import get_event, get_team_events
-from database import Database
+from ctftime_api import (
+    TeamPageVersion,
+    Validators,
+    event_mirror,
+    get_event,
+    get_events,
+    poll_team_events,
+)
+from ctf_buttons import CTFButtons
+from database import get_async_database
+from roles import backfill_role_ids, get_event_role
 
-
-class CTFButtons(discord.ui.View):
-    def __init__(self, event_id: str, event_name: str):
-        super().__init__(timeout=None)  # Buttons will not timeout
-        self.event_id = event_id
-        self.event_name = event_name
-        self.db = Database()  # Initialize database connection
-
-    @discord.ui.button(label="Join CTF", style=discord.ButtonStyle.green, emoji="✅")
-    async def join_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        try:
-            # Check if user already joined
-            if self.db.is_user_joined(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                await interaction.response.send_message(
-                    f"❌ You have already joined {self.event_name}!", ephemeral=True
-                )
-                return
-
-            # Join competition
-            if self.db.join_event(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                # Find corresponding role
-                role_name = f"CTF-{self.event_name}"
-                role = discord.utils.get(interaction.guild.roles, name=role_name)
-
-                if role:
-                    try:
-                        await interaction.user.add_roles(role)
-                        success_msg = f"✅ Role added: {role.mention}"
-                    except discord.Forbidden:
-                        success_msg = "⚠️ Could not add role (missing permissions)"
-                    except Exception as e:
-                        success_msg = f"⚠️ Error adding role: {str(e)}"
-                else:
-                    success_msg = "⚠️ Role not found"
-
-                # Get event details for DM
-                event = self.db.get_event(self.event_id, str(interaction.guild_id))
-                if event and event.get("invite_link"):
-                    try:
-                        # Send invite link via DM
-                        embed = discord.Embed(
-                            title="🔗 CTF Competition Invite Link",
-                            description=f"Competition: {self.event_name}",
-                            color=discord.Color.blue(),
-                        )
-                        embed.add_field(
-                            name="Invite Link", value=event["invite_link"], inline=False
-                        )
-                        embed.add_field(
-                            name="Note",
-                            value="Please keep this link private and do not share it with non-participants.",
-                            inline=False,
-                        )
-                        await interaction.user.send(embed=embed)
-                        success_msg += "\n✉️ Invite link has been sent via DM"
-                    except discord.Forbidden:
-                        success_msg += "\n⚠️ Could not send invite link (DMs are closed)"
-
-                await interaction.response.send_message(
-                    f"✅ Successfully joined {self.event_name}\n{success_msg}",
-                    ephemeral=True,
-                )
-            else:
-                await interaction.response.send_message(
-                    "❌ Error joining competition", ephemeral=True
-                )
-        except Exception as e:
-            await interaction.response.send_message(
-                f"❌ Error occurred: {str(e)}", ephemeral=True
-            )
-
-    @discord.ui.button(label="Leave CTF", style=discord.ButtonStyle.red, emoji="🚪")
-    async def leave_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        try:
-            # Check if user has joined
-            if not self.db.is_user_joined(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                await interaction.response.send_message(
-                    f"❌ You haven't joined {self.event_name}!", ephemeral=True
-                )
-                return
-
-            # Leave competition
-            if self.db.leave_event(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                # Remove role
-                role_name = f"CTF-{self.event_name}"
-                role = discord.utils.get(interaction.guild.roles, name=role_name)
-
-                if role and role in interaction.user.roles:
-                    try:
-                        await interaction.user.remove_roles(role)
-                        success_msg = f"✅ Role removed: {role.mention}"
-                    except discord.Forbidden:
-                        success_msg = "⚠️ Could not remove role (missing permissions)"
-                    except Exception as e:
-                        success_msg = f"⚠️ Error removing role: {str(e)}"
-                else:
-                    success_msg = ""
-
-                await interaction.response.send_message(
-                    f"✅ Successfully left {self.event_name}\n{success_msg}",
-                    ephemeral=True,
-                )
-            else:
-                await interaction.response.send_message(
-                    "❌ Error leaving competition", ephemeral=True
-                )
-        except Exception as e:
-            await interaction.response.send_message(
-                f"❌ Error occurred: {str(e)}", ephemeral=True
-            )
+# Bounds for how often a team page is polled; unchanged pages back off
+TEAM_POLL_MIN_INTERVAL = 30 * 60
+TEAM_POLL_MAX_INTERVAL = 24 * 60 * 60
 
 
 class CTF(commands.Cog):
@@ -140,13 +32,24 @@ class CTF(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = get_async_database()
+        self._expiry_wakeup = asyncio.Event()
+        self._expiry_task = None
+        self._backfill_task = None
         self.check_team_events.start()
-        self.check_ended_events.start()
+        self.sync_ctftime_mirror.start()
+
+    async def cog_load(self):
+        self._expiry_task = asyncio.create_task(self.run_expiry())
+        self._backfill_task = asyncio.create_task(self.backfill_roles())
 
     def cog_unload(self):
         self.check_team_events.cancel()
-        self.check_ended_events.cancel()
+        self.sync_ctftime_mirror.cancel()
+        if self._expiry_task:
+            self._expiry_task.cancel()
+        if self._backfill_task:
+            self._backfill_task.cancel()
 
     @commands.command()
     async def addctf(self, ctx, event_id: str):
@@ -166,14 +69,14 @@ class CTF(commands.Cog):
                 return
 
             # Check if competition already exists
-            if self.db.get_event(event_id, str(ctx.guild.id)):
+            if await self.db.get_event(event_id, str(ctx.guild.id)):
                 await loading_msg.edit(
                     content="❌ This competition has already been added"
                 )
                 return
 
             # Add competition to database
-            if self.db.add_event(
+            if await self.db.add_event(
                 event_id,
                 str(ctx.guild.id),
                 event["title"],
@@ -186,6 +89,9 @@ class CTF(commands.Cog):
                 event["ctftime_url"],
                 str(ctx.author.id),  # Adder's ID
             ):
+                self.bot.dispatch("ctf_reminders_changed", event_id, str(ctx.guild.id))
+                self.bot.dispatch("ctf_events_changed", event_id, str(ctx.guild.id))
+
                 # Create role
                 try:
                     role = await ctx.guild.create_role(
@@ -193,6 +99,9 @@ class CTF(commands.Cog):
                         color=discord.Color.blue(),
                         reason=f"Creating role for CTF competition {event['title']}",
                     )
+                    await self.db.set_event_role(
+                        event_id, str(ctx.guild.id), str(role.id)
+                    )
                 except discord.Forbidden:
                     await ctx.send("❌ No permission to create roles")
                 except Exception as e:
@@ -237,21 +146,16 @@ class CTF(commands.Cog):
                 embed.set_footer(text=f"event_id:{event_id}")
 
                 # Create view with buttons
-                view = CTFButtons(event_id=event_id, event_name=event["title"])
+                view = CTFButtons(event_id)
 
                 # Get notification channel
-                channel_id = self.db.get_notification_channel(str(ctx.guild.id))
+                channel_id = await self.db.get_notification_channel(str(ctx.guild.id))
                 if channel_id:
                     try:
                         channel = ctx.guild.get_channel(int(channel_id))
                         if channel:
                             # Send detailed embed to notification channel
-                            await channel.send(
-                                embed=embed,
-                                view=CTFButtons(
-                                    event_id=event_id, event_name=event["title"]
-                                ),
-                            )
+                            await channel.send(embed=embed, view=view)
 
                             # If command was used in notification channel, don't send another message
                             if str(ctx.channel.id) == channel_id:
@@ -298,28 +202,27 @@ class CTF(commands.Cog):
         Usage:
         !delctf <ctftime_event_id> - Delete specified CTF competition
         """
-        event = self.db.get_event(event_id, str(ctx.guild.id))
+        event = await self.db.get_event(event_id, str(ctx.guild.id))
         if not event:
             await ctx.send("❌ Competition not found")
             return
 
         # Find and delete corresponding role
-        role_name = f"CTF-{event['name']}"
-        role = discord.utils.get(ctx.guild.roles, name=role_name)
+        role = get_event_role(ctx.guild, event)
 
         if role:
             try:
                 await role.delete(
                     reason=f"Deleting role for CTF competition {event['name']}"
                 )
-                await ctx.send(f"✅ Role deleted: {role_name}")
+                await ctx.send(f"✅ Role deleted: {role.name}")
             except discord.Forbidden:
                 await ctx.send("❌ No permission to delete roles")
             except Exception as e:
                 await ctx.send(f"❌ Error deleting role: {str(e)}")
 
         # Delete notification message if exists
-        channel_id = self.db.get_notification_channel(str(ctx.guild.id))
+        channel_id = await self.db.get_notification_channel(str(ctx.guild.id))
         if channel_id:
             try:
                 channel = ctx.guild.get_channel(int(channel_id))
@@ -335,7 +238,9 @@ class CTF(commands.Cog):
             except Exception as e:
                 print(f"Error deleting notification message: {e}")
 
-        if self.db.delete_event(event_id, str(ctx.guild.id)):
+        if await self.db.delete_event(event_id, str(ctx.guild.id)):
+            self.bot.dispatch("ctf_reminders_changed", event_id, str(ctx.guild.id))
+            self.bot.dispatch("ctf_events_changed", event_id, str(ctx.guild.id))
             embed = discord.Embed(
                 title="🗑️ CTF Competition Deleted", color=discord.Color.red()
             )
@@ -347,15 +252,12 @@ class CTF(commands.Cog):
     @commands.command()
     async def listctf(self, ctx):
         """List all added CTF competitions"""
-        events = self.db.get_all_events(str(ctx.guild.id))
+        events = await self.db.get_all_events(str(ctx.guild.id))
 
         if not events:
             await ctx.send("📝 No CTF competitions added yet")
             return
 
-        # Sort by start time
-        events.sort(key=lambda x: x["start_time"])
-
         # Create main embed
         main_embed = discord.Embed(
             title="📋 CTF Competition List",
@@ -365,14 +267,14 @@ class CTF(commands.Cog):
 
         # Add competition info
         for i, event in enumerate(events, 1):
-            start_time = datetime.fromisoformat(event["start_time"])
-            end_time = datetime.fromisoformat(event["end_time"])
+            start_time = datetime.fromtimestamp(event["start_epoch"], pytz.UTC)
+            end_time = datetime.fromtimestamp(event["end_epoch"], pytz.UTC)
 
             # Convert to user's timezone
-            user_start_time = self.convert_to_user_timezone(
+            user_start_time = await self.convert_to_user_timezone(
                 start_time, str(ctx.author.id), str(ctx.guild.id)
             )
-            user_end_time = self.convert_to_user_timezone(
+            user_end_time = await self.convert_to_user_timezone(
                 end_time, str(ctx.author.id), str(ctx.guild.id)
             )
 
@@ -453,7 +355,7 @@ class CTF(commands.Cog):
         """
         try:
             # Check if competition exists
-            event = self.db.get_event(event_id, str(ctx.guild.id))
+            event = await self.db.get_event(event_id, str(ctx.guild.id))
             if not event:
                 await ctx.send(
                     "❌ Competition not found, please use !addctf to add it first"
@@ -461,7 +363,7 @@ class CTF(commands.Cog):
                 return
 
             # Check if user already joined
-            if self.db.is_user_joined(event_id, str(ctx.guild.id), str(ctx.author.id)):
+            if await self.db.is_user_joined(event_id, str(ctx.guild.id), str(ctx.author.id)):
                 embed = discord.Embed(
                     title="ℹ️ Already Joined",
                     description=f"You have already joined this competition: {event['name']}",
@@ -471,10 +373,11 @@ class CTF(commands.Cog):
                 return
 
             # Join competition
-            if self.db.join_event(event_id, str(ctx.guild.id), str(ctx.author.id)):
+            if await self.db.join_event(event_id, str(ctx.guild.id), str(ctx.author.id)):
+                self.bot.dispatch("ctf_reminders_changed", event_id, str(ctx.guild.id))
+
                 # Find corresponding role
-                role_name = f"CTF-{event['name']}"
-                role = discord.utils.get(ctx.guild.roles, name=role_name)
+                role = get_event_role(ctx.guild, event)
 
                 if role:
                     try:
@@ -571,13 +474,15 @@ class CTF(commands.Cog):
         """
         try:
             # Check if competition exists
-            event = self.db.get_event(event_id, str(ctx.guild.id))
+            event = await self.db.get_event(event_id, str(ctx.guild.id))
             if not event:
                 await ctx.send("❌ Competition not found")
                 return
 
             # Leave competition
-            if self.db.leave_event(event_id, str(ctx.guild.id), str(ctx.author.id)):
+            if await self.db.leave_event(event_id, str(ctx.guild.id), str(ctx.author.id)):
+                self.bot.dispatch("ctf_reminders_changed", event_id, str(ctx.guild.id))
+
                 embed = discord.Embed(
                     title="✅ Successfully Left Competition", color=discord.Color.blue()
                 )
@@ -594,7 +499,7 @@ class CTF(commands.Cog):
     # @commands.has_permissions(administrator=True)
     async def invitectf(self, ctx, event_id: str, invite_link: str = None):
         """Set or view competition invite link"""
-        event = self.db.get_event(event_id, str(ctx.guild.id))
+        event = await self.db.get_event(event_id, str(ctx.guild.id))
         if not event:
             await ctx.send(
                 "❌ Competition not found, please add it first using !addctf"
@@ -649,7 +554,7 @@ class CTF(commands.Cog):
                 print(f"Unknown error deleting message: {e}")
 
             # Set new invite link
-            if self.db.set_event_invite_link(event_id, str(ctx.guild.id), invite_link):
+            if await self.db.set_event_invite_link(event_id, str(ctx.guild.id), invite_link):
                 try:
                     # Send DM to admin
                     embed = discord.Embed(
@@ -673,8 +578,7 @@ class CTF(commands.Cog):
                     await ctx.send(embed=channel_embed)
 
                     # Notify all members with the competition role
-                    role_name = f"CTF-{event['name']}"
-                    role = discord.utils.get(ctx.guild.roles, name=role_name)
+                    role = get_event_role(ctx.guild, event)
                     if role:
                         # Create notification message
                         notify_embed = discord.Embed(
@@ -717,7 +621,7 @@ class CTF(commands.Cog):
     async def myctf(self, ctx):
         """View all CTF competitions you're participating in"""
         try:
-            events = self.db.get_user_events(str(ctx.guild.id), str(ctx.author.id))
+            events = await self.db.get_user_events(str(ctx.guild.id), str(ctx.author.id))
 
             if not events:
                 await ctx.send("📝 You haven't joined any CTF competitions yet")
@@ -732,14 +636,14 @@ class CTF(commands.Cog):
 
             # Add competition info
             for i, event in enumerate(events, 1):
-                start_time = datetime.fromisoformat(event["start_time"])
-                end_time = datetime.fromisoformat(event["end_time"])
+                start_time = datetime.fromtimestamp(event["start_epoch"], pytz.UTC)
+                end_time = datetime.fromtimestamp(event["end_epoch"], pytz.UTC)
 
                 # Convert to user's timezone
-                user_start_time = self.convert_to_user_timezone(
+                user_start_time = await self.convert_to_user_timezone(
                     start_time, str(ctx.author.id), str(ctx.guild.id)
                 )
-                user_end_time = self.convert_to_user_timezone(
+                user_end_time = await self.convert_to_user_timezone(
                     end_time, str(ctx.author.id), str(ctx.guild.id)
                 )
 
@@ -805,7 +709,7 @@ class CTF(commands.Cog):
         """
         try:
             # Check if competition exists
-            event = self.db.get_event(event_id, str(ctx.guild.id))
+            event = await self.db.get_event(event_id, str(ctx.guild.id))
             if not event:
                 await ctx.send(
                     "❌ Competition not found, please use !addctf to add it first"
@@ -813,7 +717,7 @@ class CTF(commands.Cog):
                 return
 
             # Get participants list
-            participants = self.db.get_event_participants(event_id, str(ctx.guild.id))
+            participants = await self.db.get_event_participants(event_id, str(ctx.guild.id))
 
             if not participants:
                 await ctx.send(f"📝 No one has joined {event['name']} yet")
@@ -833,7 +737,7 @@ class CTF(commands.Cog):
                     member = await ctx.guild.fetch_member(participant["user_id"])
                     join_time = datetime.fromisoformat(participant["join_time"])
                     # Convert to user timezone
-                    user_join_time = self.convert_to_user_timezone(
+                    user_join_time = await self.convert_to_user_timezone(
                         join_time, participant["user_id"], str(ctx.guild.id)
                     )
                     participants_list.append(
@@ -861,10 +765,10 @@ class CTF(commands.Cog):
             end_time = datetime.fromisoformat(event["end_time"])
 
             # Convert to user timezone
-            user_start_time = self.convert_to_user_timezone(
+            user_start_time = await self.convert_to_user_timezone(
                 start_time, str(ctx.author.id), str(ctx.guild.id)
             )
-            user_end_time = self.convert_to_user_timezone(
+            user_end_time = await self.convert_to_user_timezone(
                 end_time, str(ctx.author.id), str(ctx.guild.id)
             )
 
@@ -879,164 +783,277 @@ class CTF(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ Error occurred: {str(e)}")
 
-    @tasks.loop(hours=1)
+    @tasks.loop(minutes=5)
     async def check_team_events(self):
-        """Check team's planned CTF events and add them automatically"""
+        """Poll tracked teams that are due and add their planned CTF events automatically"""
         try:
-            for guild in self.bot.guilds:
-                team_id = self.db.get_ctftime_team_id(str(guild.id))
-                if not team_id:
+            # Group guilds by team so each team page is fetched once
+            teams = {}
+            for subscription in await self.db.get_team_subscriptions():
+                guild = self.bot.get_guild(int(subscription["guild_id"]))
+                if not guild or not subscription["channel_id"]:
                     continue
 
-                # Get team's planned events
-                planned_events = get_team_events(team_id)
-                if not planned_events:
+                channel = guild.get_channel(int(subscription["channel_id"]))
+                if not channel:
                     continue
 
-                # Get notification channel
-                channel_id = self.db.get_notification_channel(str(guild.id))
-                if not channel_id:
-                    continue
+                teams.setdefault(subscription["team_id"], []).append((guild, channel))
 
-                channel = guild.get_channel(int(channel_id))
-                if not channel:
+            now = int(datetime.now(pytz.UTC).timestamp())
+            states = await self.db.get_team_poll_states()
+            for team_id, guilds in teams.items():
+                guild_ids = ",".join(sorted(str(guild.id) for guild, _ in guilds))
+                state = states.get(team_id)
+
+                # A team is polled right away when the guilds tracking it change
+                if (
+                    state
+                    and state["guild_ids"] == guild_ids
+                    and state["next_poll_epoch"] > now
+                ):
                     continue
 
-                # Check each planned event
-                for event in planned_events:
-                    # Check if event already exists
-                    if self.db.get_event(event["id"], str(guild.id)):
-                        continue
-
-                    # Get event details
-                    event_details = await get_event(event["id"])
-                    if not event_details:
-                        continue
-
-                    # Add event to database
-                    if self.db.add_event(
-                        event["id"],
-                        str(guild.id),
-                        event_details["title"],
-                        event_details["start"],
-                        event_details["finish"],
-                        event_details["format"],
-                        event_details["weight"],
-                        event_details["location"],
-                        event_details["url"],
-                        event_details["ctftime_url"],
-                        None,  # No adder for automatic imports
-                    ):
-                        # Create role
-                        try:
-                            role = await guild.create_role(
-                                name=f"CTF-{event_details['title']}",
-                                color=discord.Color.blue(),
-                                reason=f"Creating role for CTF competition {event_details['title']}",
-                            )
-                        except discord.Forbidden:
-                            print(f"No permission to create role in guild {guild.id}")
-                        except Exception as e:
-                            print(f"Error creating role: {e}")
+                await self.poll_team(team_id, guild_ids, guilds, state)
 
-                        # Send notification
-                        embed = discord.Embed(
-                            title="🎯 New CTF Competition Added",
-                            description=f"**Competition Name:**\n{event_details['title']}\n\n**ID:** `{event['id']}`",
-                            color=discord.Color.blue(),
-                        )
+        except Exception as e:
+            print(f"Error checking team events: {str(e)}")
 
-                        # Add time information
-                        start_time = datetime.fromisoformat(event_details["start"])
-                        end_time = datetime.fromisoformat(event_details["finish"])
-                        time_info = (
-                            f"**Start Time:**\n{start_time.strftime('%Y-%m-%d %H:%M')} UTC\n\n"
-                            f"**End Time:**\n{end_time.strftime('%Y-%m-%d %H:%M')} UTC"
-                        )
-                        embed.add_field(
-                            name="⏰ Time Information", value=time_info, inline=False
-                        )
+    async def poll_team(self, team_id: str, guild_ids: str, guilds: list, state):
+        """Poll a team page and reschedule it based on whether it changed"""
+        # The stored version and back-off only hold for the guilds it was imported into
+        version = None
+        interval = TEAM_POLL_MIN_INTERVAL
+        if state and state["guild_ids"] == guild_ids:
+            version = TeamPageVersion(
+                Validators(state["etag"], state["last_modified"]), state["digest"]
+            )
+            interval = state["poll_interval"]
+
+        planned_events, new_version = await poll_team_events(team_id, version)
+        if new_version is None:
+            # Fetch failed, so keep what the last poll saw and retry soon
+            new_version = version or TeamPageVersion()
+            interval = TEAM_POLL_MIN_INTERVAL
+        elif planned_events is None:
+            # Unchanged, so back off
+            interval = min(interval * 2, TEAM_POLL_MAX_INTERVAL)
+        else:
+            # Changed, so poll often while the team is registering for events
+            interval = TEAM_POLL_MIN_INTERVAL
+            if planned_events and not await self.import_team_events(
+                planned_events, guilds
+            ):
+                # Forget the version so the next poll retries the import
+                new_version = TeamPageVersion()
+
+        await self.db.set_team_poll_state(
+            team_id,
+            guild_ids,
+            new_version.validators.etag,
+            new_version.validators.last_modified,
+            new_version.digest,
+            interval,
+            int(datetime.now(pytz.UTC).timestamp()) + interval,
+        )
 
-                        # Add competition details
-                        details = f"**Type:** {event_details['format']}\n**Weight:** {event_details['weight']}\n"
-                        if event_details["location"]:
-                            details += f"**Location:** {event_details['location']}\n"
-                        embed.add_field(
-                            name="📋 Competition Details", value=details, inline=False
-                        )
+    async def import_team_events(self, planned_events: list, guilds: list) -> bool:
+        """Import a team's new planned events into every guild tracking it"""
+        # Work out which planned events each guild is missing
+        missing = []
+        for guild, channel in guilds:
+            existing = {
+                event["event_id"]
+                for event in await self.db.get_all_events(str(guild.id))
+            }
+            events = [event for event in planned_events if event["id"] not in existing]
+            missing.append((guild, channel, events))
+
+        # Fetch details for each new event once, whichever guilds need it
+        event_ids = list(
+            dict.fromkeys(event["id"] for _, _, events in missing for event in events)
+        )
+        events_details = dict(zip(event_ids, await get_events(event_ids)))
 
-                        # Add links
-                        links = (
-                            f"**Official Link:**\n[Click to Visit]({event_details['url']})\n\n"
-                            f"**CTFtime Link:**\n[Click to Visit]({event_details['ctftime_url']})"
-                        )
-                        embed.add_field(name="🔗 Links", value=links, inline=False)
-                        embed.set_footer(text=f"event_id:{event['id']}")
+        for guild, channel, events in missing:
+            for event in events:
+                event_details = events_details[event["id"]]
+                if not event_details:
+                    continue
 
-                        # Create view with buttons
-                        view = CTFButtons(
-                            event_id=event["id"], event_name=event["title"]
-                        )
+                # One guild failing, e.g. without Send Messages, must not stop the rest
+                try:
+                    await self.add_team_event(guild, channel, event, event_details)
+                except Exception as e:
+                    print(
+                        f"Error adding team event {event['id']} in guild {guild.id}: {str(e)}"
+                    )
 
-                        await channel.send(embed=embed,view=view)
+        return all(events_details.values())
 
+    async def add_team_event(
+        self, guild: discord.Guild, channel, event: dict, event_details: dict
+    ):
+        """Add one of the team's planned events to a guild and announce it"""
+        # Add event to database
+        if not await self.db.add_event(
+            event["id"],
+            str(guild.id),
+            event_details["title"],
+            event_details["start"],
+            event_details["finish"],
+            event_details["format"],
+            event_details["weight"],
+            event_details["location"],
+            event_details["url"],
+            event_details["ctftime_url"],
+            None,  # No adder for automatic imports
+        ):
+            return
+        self.bot.dispatch("ctf_reminders_changed", event["id"], str(guild.id))
+        self.bot.dispatch("ctf_events_changed", event["id"], str(guild.id))
+
+        # Create role
+        try:
+            role = await guild.create_role(
+                name=f"CTF-{event_details['title']}",
+                color=discord.Color.blue(),
+                reason=f"Creating role for CTF competition {event_details['title']}",
+            )
+            await self.db.set_event_role(event["id"], str(guild.id), str(role.id))
+        except discord.Forbidden:
+            print(f"No permission to create role in guild {guild.id}")
         except Exception as e:
-            print(f"Error checking team events: {str(e)}")
+            print(f"Error creating role: {e}")
+
+        # Send notification
+        embed = discord.Embed(
+            title="🎯 New CTF Competition Added",
+            description=f"**Competition Name:**\n{event_details['title']}\n\n**ID:** `{event['id']}`",
+            color=discord.Color.blue(),
+        )
+
+        # Add time information
+        start_time = datetime.fromisoformat(event_details["start"])
+        end_time = datetime.fromisoformat(event_details["finish"])
+        time_info = (
+            f"**Start Time:**\n{start_time.strftime('%Y-%m-%d %H:%M')} UTC\n\n"
+            f"**End Time:**\n{end_time.strftime('%Y-%m-%d %H:%M')} UTC"
+        )
+        embed.add_field(name="⏰ Time Information", value=time_info, inline=False)
+
+        # Add competition details
+        details = f"**Type:** {event_details['format']}\n**Weight:** {event_details['weight']}\n"
+        if event_details["location"]:
+            details += f"**Location:** {event_details['location']}\n"
+        embed.add_field(name="📋 Competition Details", value=details, inline=False)
+
+        # Add links
+        links = (
+            f"**Official Link:**\n[Click to Visit]({event_details['url']})\n\n"
+            f"**CTFtime Link:**\n[Click to Visit]({event_details['ctftime_url']})"
+        )
+        embed.add_field(name="🔗 Links", value=links, inline=False)
+        embed.set_footer(text=f"event_id:{event['id']}")
+
+        # Create view with buttons
+        view = CTFButtons(event["id"])
+
+        await channel.send(embed=embed, view=view)
 
     @check_team_events.before_loop
     async def before_check_team_events(self):
         """Wait until the bot is ready before starting the task"""
         await self.bot.wait_until_ready()
 
-    @tasks.loop(hours=1)  # Check every hour
+    async def backfill_roles(self):
+        """Record role IDs for events whose roles were created before IDs were stored"""
+        await self.bot.wait_until_ready()
+        try:
+            filled = await backfill_role_ids(self.bot, self.db)
+            if filled:
+                print(f"Backfilled role IDs for {filled} events")
+        except Exception as e:
+            print(f"Error backfilling role IDs: {e}")
+
+    @commands.Cog.listener()
+    async def on_ctf_events_changed(self, event_id: str, guild_id: str):
+        """Recheck the next end time after an event is added, imported or removed"""
+        self._expiry_wakeup.set()
+
+    async def run_expiry(self):
+        """Sleep until the next event ends, then clean up every ended event"""
+        await self.bot.wait_until_ready()
+
+        while True:
+            self._expiry_wakeup.clear()
+            await self.check_ended_events()
+
+            # Only future end times, so a row that could not be cleaned up
+            # cannot hold the timer in the past
+            next_end = await self.db.get_next_end_epoch(int(time.time()))
+            timeout = None if next_end is None else max(1, next_end - time.time())
+            try:
+                await asyncio.wait_for(self._expiry_wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
     async def check_ended_events(self):
         """Check for ended events and clean up roles"""
         try:
-            # Get all guilds
-            for guild in self.bot.guilds:
-                # Get all events for this guild
-                events = self.db.get_all_events(str(guild.id))
-
-                for event in events:
-                    # Check if event has ended
-                    end_time = datetime.fromisoformat(event["end_time"])
-                    if datetime.now(end_time.tzinfo) > end_time:
-                        # Find and delete corresponding role
-                        role_name = f"CTF-{event['name']}"
-                        role = discord.utils.get(guild.roles, name=role_name)
-
-                        if role:
-                            try:
-                                await role.delete(
-                                    reason=f"Automatically deleting role for ended CTF competition {event['name']}"
-                                )
-                                print(
-                                    f"✅ Automatically deleted role {role_name} for ended competition in guild {guild.id}"
-                                )
-                            except discord.Forbidden:
-                                print(
-                                    f"❌ No permission to delete role in guild {guild.id}"
-                                )
-                            except Exception as e:
-                                print(f"❌ Error deleting role: {e}")
+            now = int(datetime.now(pytz.UTC).timestamp())
+            for event in await self.db.get_ended_events(now):
+                guild = self.bot.get_guild(int(event["guild_id"]))
+                if not guild:
+                    # The bot is no longer in this guild, so only the row is left
+                    await self.db.delete_event(event["event_id"], event["guild_id"])
+                    continue
 
-                        # Delete the event from database
-                        self.db.delete_event(event["event_id"], str(guild.id))
+                # Find and delete corresponding role
+                role = get_event_role(guild, event)
+
+                if role:
+                    try:
+                        await role.delete(
+                            reason=f"Automatically deleting role for ended CTF competition {event['name']}"
+                        )
+                        print(
+                            f"✅ Automatically deleted role {role.name} for ended competition in guild {guild.id}"
+                        )
+                    except discord.Forbidden:
+                        print(f"❌ No permission to delete role in guild {guild.id}")
+                    except Exception as e:
+                        print(f"❌ Error deleting role: {e}")
+
+                # Delete the event from database
+                await self.db.delete_event(event["event_id"], str(guild.id))
+                self.bot.dispatch(
+                    "ctf_reminders_changed", event["event_id"], str(guild.id)
+                )
 
         except Exception as e:
             print(f"Error in check_ended_events: {e}")
 
-    @check_ended_events.before_loop
-    async def before_check_ended_events(self):
+    @tasks.loop(hours=6)
+    async def sync_ctftime_mirror(self):
+        """Refresh the local mirror of upcoming CTFtime events"""
+        try:
+            stored = await event_mirror.sync()
+            print(f"Synced {stored} upcoming events from CTFtime")
+        except Exception as e:
+            print(f"Error syncing CTFtime mirror: {e}")
+
+    @sync_ctftime_mirror.before_loop
+    async def before_sync_ctftime_mirror(self):
         """Wait until the bot is ready before starting the task"""
         await self.bot.wait_until_ready()
 
-    def convert_to_user_timezone(
+    async def convert_to_user_timezone(
         self, dt: datetime, user_id: str, guild_id: str
     ) -> datetime:
         """Convert UTC time to user's timezone"""
         try:
-            user_tz = self.db.get_user_timezone(user_id, guild_id)
+            user_tz = await self.db.get_user_timezone(user_id, guild_id)
             tz = pytz.timezone(user_tz)
             return dt.astimezone(tz)
         except Exception:
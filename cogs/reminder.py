@@ -2,22 +2,96 @@
 CTF event reminder management commands.
 """
 
+import asyncio
+import os
+import time
+
 import pytz
 from datetime import datetime, timedelta
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+
+from database import AsyncDatabase, get_async_database
+from scheduler import HeapScheduler, TimingWheelScheduler
+
+# Reminder scheduler backends, selected with the REMINDER_SCHEDULER variable
+SCHEDULERS = {
+    "heap": HeapScheduler,
+    "wheel": TimingWheelScheduler,
+}
+
+# Reminders used when a participant has not chosen any
+DEFAULT_BEFORE_START = "24h_before,1h_before"
+DEFAULT_BEFORE_END = "1h_before_end,10m_before_end"
+
+# Reminder option -> (label, "start" or "end", lead time, send tolerance)
+REMINDERS = {
+    "24h_before": (
+        "24 hours before",
+        "start",
+        timedelta(hours=24),
+        timedelta(minutes=5),
+    ),
+    "12h_before": (
+        "12 hours before",
+        "start",
+        timedelta(hours=12),
+        timedelta(minutes=5),
+    ),
+    "1h_before": (
+        "1 hour before",
+        "start",
+        timedelta(hours=1),
+        timedelta(minutes=5),
+    ),
+    "1h_before_end": (
+        "1 hour before",
+        "end",
+        timedelta(hours=1),
+        timedelta(minutes=5),
+    ),
+    "30m_before_end": (
+        "30 minutes before",
+        "end",
+        timedelta(minutes=30),
+        timedelta(minutes=5),
+    ),
+    "10m_before_end": (
+        "10 minutes before",
+        "end",
+        timedelta(minutes=10),
+        timedelta(minutes=2),
+    ),
+}
+
+def reminder_times(row: dict) -> list:
+    """List (option, fire epoch) for every reminder a participant wants"""
+    before_start = row["before_start"]
+    before_end = row["before_end"]
+    if not before_start and not before_end:
+        # 使用預設值
+        before_start = DEFAULT_BEFORE_START
+        before_end = DEFAULT_BEFORE_END
+
+    times = []
+    for option in f"{before_start or ''},{before_end or ''}".split(","):
+        if option not in REMINDERS:
+            continue
+        _, base, lead, _ = REMINDERS[option]
+        epoch = row["start_epoch"] if base == "start" else row["end_epoch"]
+        times.append((option, epoch - int(lead.total_seconds())))
+    return times
 
-from database import Database
 
 class ReminderSelect(discord.ui.View):
-    def __init__(self, event_id: str, event_name: str):
+    def __init__(self, event_id: str, event_name: str, db: AsyncDatabase):
         super().__init__(timeout=300)  # 5 minutes timeout
         self.event_id = event_id
         self.event_name = event_name
         self.selected_start = []
         self.selected_end = []
-        self.db = Database()  # Initialize database connection
+        self.db = db
 
     @discord.ui.select(
         placeholder="Select reminder times before competition starts",
@@ -61,7 +135,7 @@ class ReminderSelect(discord.ui.View):
             self.selected_end = ["1h_before_end", "10m_before_end"]
 
         # Save settings
-        if self.db.set_reminder_settings(
+        if await self.db.set_reminder_settings(
             self.event_id,
             str(interaction.guild_id),
             str(interaction.user.id),
@@ -104,6 +178,9 @@ class ReminderSelect(discord.ui.View):
 
             # Send confirmation message
             await interaction.response.send_message(embed=embed, ephemeral=False)
+            interaction.client.dispatch(
+                "ctf_reminders_changed", self.event_id, str(interaction.guild_id)
+            )
 
             # Delete original message
             try:
@@ -122,179 +199,132 @@ class ReminderSelect(discord.ui.View):
 class Reminder(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = get_async_database()
+        backend = os.getenv("REMINDER_SCHEDULER", "heap").lower()
+        if backend not in SCHEDULERS:
+            print(f"Unknown REMINDER_SCHEDULER {backend!r}, using heap")
+            backend = "heap"
+        self.scheduler = SCHEDULERS[backend]()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    async def cog_load(self):
+        self._task = asyncio.create_task(self.run_scheduler())
+
+    async def cog_unload(self):
+        if self._task:
+            self._task.cancel()
+
+    async def load_reminders(self, event_id: str = None, guild_id: str = None):
+        """(Re)schedule reminders for one event, or for every event if none is given"""
+        now_epoch = int(time.time())
+        if event_id is not None:
+            self.scheduler.cancel_group((event_id, guild_id))
+
+        pending = []
+        for row in await self.db.get_reminder_candidates(
+            now_epoch, event_id=event_id, guild_id=guild_id
+        ):
+            for option, fire_epoch in reminder_times(row):
+                tolerance = REMINDERS[option][3].total_seconds()
+                if now_epoch - fire_epoch > tolerance:
+                    continue  # 已錯過提醒時間
+                key = (row["event_id"], row["guild_id"], row["user_id"], option)
+                pending.append((key, row, fire_epoch))
+
+        # The outbox records what is scheduled; already sent reminders are skipped
+        sent = await self.db.schedule_reminders(
+            [(*key, fire_epoch) for key, _, fire_epoch in pending], event_id, guild_id
+        )
+        for key, row, fire_epoch in pending:
+            if key in sent:
+                continue
+            self.scheduler.schedule(
+                key,
+                fire_epoch,
+                (row, fire_epoch),
+                group=(row["event_id"], row["guild_id"]),
+            )
+        self._wakeup.set()
 
-    def convert_to_user_timezone(self, dt: datetime, user_id: str, guild_id: str) -> datetime:
-        """Convert UTC time to user's timezone"""
+    @commands.Cog.listener()
+    async def on_ctf_reminders_changed(self, event_id: str, guild_id: str):
+        """Reschedule an event's reminders after its participants or settings change"""
         try:
-            user_tz = self.db.get_user_timezone(user_id, guild_id)
-            tz = pytz.timezone(user_tz)
-            return dt.astimezone(tz)
-        except Exception:
-            return dt
-        
-    @tasks.loop(minutes=1)  # Check every minute
-    async def check_ctf_events(self):
-        """Check CTF competition times and send reminders"""
-        try:
-            for guild in self.bot.guilds:
-                events = self.db.get_all_events(str(guild.id))
-                now = datetime.now(pytz.UTC)
-
-                for event in events:
-                    start_time = datetime.fromisoformat(event["start_time"])
-                    end_time = datetime.fromisoformat(event["end_time"])
-
-                    # 跳過已結束的比賽
-                    if now > end_time:
-                        continue
-
-                    # 取得該比賽的所有參與者
-                    participants = self.db.get_event_participants(
-                        event["event_id"], str(guild.id)
-                    )
-
-                    for participant in participants:
-                        user_id = participant["user_id"]
-
-                        # 取得使用者的提醒設定
-                        before_start, before_end = self.db.get_reminder_settings(
-                            event["event_id"], str(guild.id), user_id
-                        )
-                        if not before_start and not before_end:
-                            # 使用預設值
-                            before_start = "24h_before,1h_before"
-                            before_end = "1h_before_end,10m_before_end"
-
-                        # 轉換時間到使用者時區
-                        user_start_time = self.convert_to_user_timezone(
-                            start_time, user_id, str(guild.id)
-                        )
-                        user_end_time = self.convert_to_user_timezone(
-                            end_time, user_id, str(guild.id)
-                        )
-
-                        # 檢查開始時間提醒
-                        if before_start:
-                            for remind_time in before_start.split(","):
-                                if remind_time == "24h_before":
-                                    time_diff = user_start_time - now
-                                    if (
-                                        timedelta(hours=23, minutes=55)
-                                        <= time_diff
-                                        <= timedelta(hours=24, minutes=5)
-                                    ):
-                                        await self.send_reminder(
-                                            guild,
-                                            user_id,
-                                            event,
-                                            "24 hours before",
-                                            user_start_time,
-                                            user_end_time,
-                                        )
-                                elif remind_time == "12h_before":
-                                    time_diff = user_start_time - now
-                                    if (
-                                        timedelta(hours=11, minutes=55)
-                                        <= time_diff
-                                        <= timedelta(hours=12, minutes=5)
-                                    ):
-                                        await self.send_reminder(
-                                            guild,
-                                            user_id,
-                                            event,
-                                            "12 hours before",
-                                            user_start_time,
-                                            user_end_time,
-                                        )
-                                elif remind_time == "1h_before":
-                                    time_diff = user_start_time - now
-                                    if (
-                                        timedelta(minutes=55)
-                                        <= time_diff
-                                        <= timedelta(hours=1, minutes=5)
-                                    ):
-                                        await self.send_reminder(
-                                            guild,
-                                            user_id,
-                                            event,
-                                            "1 hour before",
-                                            user_start_time,
-                                            user_end_time,
-                                        )
-
-                        # 檢查結束時間提醒
-                        if (
-                            before_end and now > user_start_time
-                        ):  # 只在比賽開始後檢查結束時間提醒
-                            for remind_time in before_end.split(","):
-                                if remind_time == "1h_before_end":
-                                    time_diff = user_end_time - now
-                                    if (
-                                        timedelta(minutes=55)
-                                        <= time_diff
-                                        <= timedelta(hours=1, minutes=5)
-                                    ):
-                                        await self.send_reminder(
-                                            guild,
-                                            user_id,
-                                            event,
-                                            "1 hour before",
-                                            user_start_time,
-                                            user_end_time,
-                                            is_end=True,
-                                        )
-                                elif remind_time == "30m_before_end":
-                                    time_diff = user_end_time - now
-                                    if (
-                                        timedelta(minutes=25)
-                                        <= time_diff
-                                        <= timedelta(minutes=35)
-                                    ):
-                                        await self.send_reminder(
-                                            guild,
-                                            user_id,
-                                            event,
-                                            "30 minutes before",
-                                            user_start_time,
-                                            user_end_time,
-                                            is_end=True,
-                                        )
-                                elif remind_time == "10m_before_end":
-                                    time_diff = user_end_time - now
-                                    if (
-                                        timedelta(minutes=8)
-                                        <= time_diff
-                                        <= timedelta(minutes=12)
-                                    ):
-                                        await self.send_reminder(
-                                            guild,
-                                            user_id,
-                                            event,
-                                            "10 minutes before",
-                                            user_start_time,
-                                            user_end_time,
-                                            is_end=True,
-                                        )
-
+            await self.load_reminders(event_id, guild_id)
         except Exception as e:
-            print(f"Error checking CTF competitions: {str(e)}")
+            print(f"Error rescheduling reminders: {e}")
 
+    async def run_scheduler(self):
+        """Sleep until the next reminder is due, then send everything that is due"""
+        await self.bot.wait_until_ready()
+        await self.load_reminders()
 
-    async def send_reminder(
-            self,guild, user_id, event, time_str, start_time, end_time, is_end=False
-    ):
-        """Send reminder message"""
+        while True:
+            self._wakeup.clear()
+            next_fire = self.scheduler.next_fire()
+            timeout = None if next_fire is None else max(0, next_fire - time.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.send_due_reminders()
+            except Exception as e:
+                print(f"Error checking CTF competitions: {str(e)}")
+
+    async def send_due_reminders(self):
+        """Send every reminder whose fire time has passed"""
+        now_epoch = int(time.time())
+        for key, _, (row, fire_epoch) in self.scheduler.pop_due(now_epoch):
+            time_str, base, _, tolerance = REMINDERS[key[3]]
+            if now_epoch - fire_epoch > tolerance.total_seconds():
+                continue  # 已錯過提醒時間
+            # 結束提醒只在比賽開始後發送
+            if base == "end" and now_epoch <= row["start_epoch"]:
+                continue
+
+            guild = self.bot.get_guild(int(row["guild_id"]))
+            if not guild:
+                continue
+
+            # The outbox marks each reminder once delivered so it is only sent once
+            if await self.db.is_reminder_sent(*key):
+                continue
+            if await self.send_reminder(guild, row, time_str, is_end=base == "end"):
+                await self.db.mark_reminder_sent(*key)
+            else:
+                # Retry in a minute while still inside the send window
+                self.scheduler.schedule(
+                    key,
+                    now_epoch + 60,
+                    (row, fire_epoch),
+                    group=(row["event_id"], row["guild_id"]),
+                )
+
+    async def send_reminder(self, guild, row, time_str, is_end=False) -> bool:
+        """Send reminder message, returning False if it should be retried"""
         try:
-            member = await guild.fetch_member(int(user_id))
+            member = await guild.fetch_member(int(row["user_id"]))
             if not member:
-                return
+                return True
+
+            # 轉換時間到使用者時區
+            try:
+                tz = pytz.timezone(
+                    await self.db.get_user_timezone(row["user_id"], row["guild_id"])
+                )
+            except pytz.exceptions.UnknownTimeZoneError:
+                tz = pytz.UTC
+            start_time = datetime.fromtimestamp(row["start_epoch"], tz)
+            end_time = datetime.fromtimestamp(row["end_epoch"], tz)
 
             embed = discord.Embed(
                 title="🏁 Competition Ending Soon"
                 if is_end
                 else "🎯 Competition Starting Soon",
-                description=f"Competition: {event['name']}\n\n{time_str} until competition {'ends' if is_end else 'starts'}",
+                description=f"Competition: {row['name']}\n\n{time_str} until competition {'ends' if is_end else 'starts'}",
                 color=discord.Color.red() if is_end else discord.Color.green(),
             )
 
@@ -304,22 +334,27 @@ class Reminder(commands.Cog):
             )
             embed.add_field(name="⏰ Time Information", value=time_info, inline=False)
 
-            if event["official_url"]:
+            if row["official_url"]:
                 embed.add_field(
-                    name="🔗 Competition Link", value=event["official_url"], inline=False
+                    name="🔗 Competition Link", value=row["official_url"], inline=False
                 )
 
             try:
                 await member.send(embed=embed)
             except discord.Forbidden:
                 # If cannot send DM, try to remind in notification channel
-                channel_id = self.db.get_notification_channel(str(guild.id))
+                channel_id = await self.db.get_notification_channel(str(guild.id))
                 if channel_id:
                     channel = guild.get_channel(int(channel_id))
                     if channel:
                         await channel.send(f"{member.mention}", embed=embed)
+            return True
+        except discord.NotFound:
+            # Member left the server
+            return True
         except Exception as e:
             print(f"Error sending reminder: {e}")
+            return False
 
     @commands.command()
     async def setremind(self,ctx, event_id: str = None):
@@ -331,17 +366,17 @@ class Reminder(commands.Cog):
             await ctx.send("❌ Please provide an event ID")
             return
 
-        event = self.db.get_event(event_id, str(ctx.guild.id))
+        event = await self.db.get_event(event_id, str(ctx.guild.id))
         if not event:
             await ctx.send("❌ Competition not found")
             return
 
         # Check if user has joined the competition
-        if not self.db.is_user_joined(event_id, str(ctx.guild.id), str(ctx.author.id)):
+        if not await self.db.is_user_joined(event_id, str(ctx.guild.id), str(ctx.author.id)):
             await ctx.send("❌ You haven't joined this competition")
             return
 
-        view = ReminderSelect(event_id=event_id, event_name=event["name"])
+        view = ReminderSelect(event_id=event_id, event_name=event["name"], db=self.db)
         embed = discord.Embed(
             title="⏰ Set Competition Reminders",
             description=f"Competition: {event['name']}\n\nSelect when you want to receive reminders before the competition starts and ends.\nDefault values if none selected:\nStart: 24 hours and 1 hour before\nEnd: 1 hour and 10 minutes before",
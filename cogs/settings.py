@@ -6,130 +6,9 @@ import discord
 from discord.ext import commands
 import pytz
 from datetime import datetime
-from database import Database
-from ctftime_api import get_event, get_team_events
-
-class CTFButtons(discord.ui.View):
-    def __init__(self, event_id: str, event_name: str):
-        super().__init__(timeout=None)  # Buttons will not timeout
-        self.event_id = event_id
-        self.event_name = event_name
-        self.db = Database()  # Initialize database connection
-
-    @discord.ui.button(label="Join CTF", style=discord.ButtonStyle.green, emoji="✅")
-    async def join_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        try:
-            # Check if user already joined
-            if self.db.is_user_joined(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                await interaction.response.send_message(
-                    f"❌ You have already joined {self.event_name}!", ephemeral=True
-                )
-                return
-
-            # Join competition
-            if self.db.join_event(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                # Find corresponding role
-                role_name = f"CTF-{self.event_name}"
-                role = discord.utils.get(interaction.guild.roles, name=role_name)
-
-                if role:
-                    try:
-                        await interaction.user.add_roles(role)
-                        success_msg = f"✅ Role added: {role.mention}"
-                    except discord.Forbidden:
-                        success_msg = "⚠️ Could not add role (missing permissions)"
-                    except Exception as e:
-                        success_msg = f"⚠️ Error adding role: {str(e)}"
-                else:
-                    success_msg = "⚠️ Role not found"
-
-                # Get event details for DM
-                event = self.db.get_event(self.event_id, str(interaction.guild_id))
-                if event and event.get("invite_link"):
-                    try:
-                        # Send invite link via DM
-                        embed = discord.Embed(
-                            title="🔗 CTF Competition Invite Link",
-                            description=f"Competition: {self.event_name}",
-                            color=discord.Color.blue(),
-                        )
-                        embed.add_field(
-                            name="Invite Link", value=event["invite_link"], inline=False
-                        )
-                        embed.add_field(
-                            name="Note",
-                            value="Please keep this link private and do not share it with non-participants.",
-                            inline=False,
-                        )
-                        await interaction.user.send(embed=embed)
-                        success_msg += "\n✉️ Invite link has been sent via DM"
-                    except discord.Forbidden:
-                        success_msg += "\n⚠️ Could not send invite link (DMs are closed)"
-
-                await interaction.response.send_message(
-                    f"✅ Successfully joined {self.event_name}\n{success_msg}",
-                    ephemeral=True,
-                )
-            else:
-                await interaction.response.send_message(
-                    "❌ Error joining competition", ephemeral=True
-                )
-        except Exception as e:
-            await interaction.response.send_message(
-                f"❌ Error occurred: {str(e)}", ephemeral=True
-            )
-
-    @discord.ui.button(label="Leave CTF", style=discord.ButtonStyle.red, emoji="🚪")
-    async def leave_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        try:
-            # Check if user has joined
-            if not self.db.is_user_joined(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                await interaction.response.send_message(
-                    f"❌ You haven't joined {self.event_name}!", ephemeral=True
-                )
-                return
-
-            # Leave competition
-            if self.db.leave_event(
-                self.event_id, str(interaction.guild_id), str(interaction.user.id)
-            ):
-                # Remove role
-                role_name = f"CTF-{self.event_name}"
-                role = discord.utils.get(interaction.guild.roles, name=role_name)
-
-                if role and role in interaction.user.roles:
-                    try:
-                        await interaction.user.remove_roles(role)
-                        success_msg = f"✅ Role removed: {role.mention}"
-                    except discord.Forbidden:
-                        success_msg = "⚠️ Could not remove role (missing permissions)"
-                    except Exception as e:
-                        success_msg = f"⚠️ Error removing role: {str(e)}"
-                else:
-                    success_msg = ""
-
-                await interaction.response.send_message(
-                    f"✅ Successfully left {self.event_name}\n{success_msg}",
-                    ephemeral=True,
-                )
-            else:
-                await interaction.response.send_message(
-                    "❌ Error leaving competition", ephemeral=True
-                )
-        except Exception as e:
-            await interaction.response.send_message(
-                f"❌ Error occurred: {str(e)}", ephemeral=True
-            )
+from database import get_async_database
+from ctf_buttons import CTFButtons
+from ctftime_api import get_events, get_team_events
 
 
 class Settings(commands.Cog):
@@ -137,7 +16,7 @@ class Settings(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.db = Database()
+        self.db = get_async_database()
 
     @commands.command()
     #@commands.has_permissions(administrator=True)
@@ -149,7 +28,7 @@ class Settings(commands.Cog):
         """
         if channel is None:
             # View current channel
-            channel_id = self.db.get_notification_channel(str(ctx.guild.id))
+            channel_id = await self.db.get_notification_channel(str(ctx.guild.id))
             if channel_id:
                 try:
                     channel = ctx.guild.get_channel(int(channel_id))
@@ -170,7 +49,7 @@ class Settings(commands.Cog):
             return
 
         # Set new channel
-        if self.db.set_notification_channel(str(ctx.guild.id), str(channel.id)):
+        if await self.db.set_notification_channel(str(ctx.guild.id), str(channel.id)):
             await ctx.send(f"✅ Notification channel set to {channel.mention}")
         else:
             await ctx.send("❌ Error setting notification channel")
@@ -185,7 +64,7 @@ class Settings(commands.Cog):
         """
         if team_id is None:
             # View current team ID
-            current_team_id = self.db.get_ctftime_team_id(str(ctx.guild.id))
+            current_team_id = await self.db.get_ctftime_team_id(str(ctx.guild.id))
             if current_team_id:
                 embed = discord.Embed(
                     title="CTFtime Team ID",
@@ -203,7 +82,7 @@ class Settings(commands.Cog):
             return
 
         # Set new team ID
-        if self.db.set_ctftime_team_id(str(ctx.guild.id), team_id):
+        if await self.db.set_ctftime_team_id(str(ctx.guild.id), team_id):
             embed = discord.Embed(
                 title="✅ CTFtime Team ID Set",
                 description=f"Team ID: `{team_id}`",
@@ -216,7 +95,7 @@ class Settings(commands.Cog):
             )
             await ctx.send(embed=embed)
             # Get notification channel
-            channel_id = self.db.get_notification_channel(str(ctx.guild.id))
+            channel_id = await self.db.get_notification_channel(str(ctx.guild.id))
             if not channel_id:
                 await ctx.send(
                     "⚠️ No notification channel set. Please use `!setnotify #channel` to set one."
@@ -233,7 +112,7 @@ class Settings(commands.Cog):
 
             try:
                 # Get team's planned events
-                planned_events = get_team_events(team_id)
+                planned_events = await get_team_events(team_id)
                 if not planned_events:
                     await loading_msg.edit(
                         content="❌ No planned events found or failed to fetch events."
@@ -245,20 +124,26 @@ class Settings(commands.Cog):
                 skipped_count = 0
                 error_count = 0
 
+                new_events = []
                 for event in planned_events:
                     # Check if event already exists
-                    if self.db.get_event(event["id"], str(ctx.guild.id)):
+                    if await self.db.get_event(event["id"], str(ctx.guild.id)):
                         skipped_count += 1
-                        continue
+                    else:
+                        new_events.append(event)
 
-                    # Get event details
-                    event_details = await get_event(event["id"])
+                # Fetch details for the new events in parallel
+                events_details = await get_events(
+                    [event["id"] for event in new_events]
+                )
+
+                for event, event_details in zip(new_events, events_details):
                     if not event_details:
                         error_count += 1
                         continue
 
                     # Add event to database
-                    if self.db.add_event(
+                    if await self.db.add_event(
                         event["id"],
                         str(ctx.guild.id),
                         event_details["title"],
@@ -271,6 +156,13 @@ class Settings(commands.Cog):
                         event_details["ctftime_url"],
                         str(ctx.author.id),  # Use command user's ID as adder
                     ):
+                        self.bot.dispatch(
+                            "ctf_reminders_changed", event["id"], str(ctx.guild.id)
+                        )
+                        self.bot.dispatch(
+                            "ctf_events_changed", event["id"], str(ctx.guild.id)
+                        )
+
                         # Create role
                         try:
                             role = await ctx.guild.create_role(
@@ -278,6 +170,9 @@ class Settings(commands.Cog):
                                 color=discord.Color.blue(),
                                 reason=f"Creating role for CTF competition {event_details['title']}",
                             )
+                            await self.db.set_event_role(
+                                event["id"], str(ctx.guild.id), str(role.id)
+                            )
                         except discord.Forbidden:
                             print(f"No permission to create role in guild {ctx.guild.id}")
                         except Exception as e:
@@ -318,9 +213,7 @@ class Settings(commands.Cog):
                         embed.set_footer(text=f"event_id:{event['id']}")
                         
                         # Create view with buttons
-                        view = CTFButtons(
-                            event_id=event["id"], event_name=event["title"]
-                        )
+                        view = CTFButtons(event["id"])
 
                         await channel.send(embed=embed, view=view)
                         imported_count += 1
@@ -353,7 +246,7 @@ class Settings(commands.Cog):
         try:
             if timezone_str is None:
                 # Show current timezone setting
-                current_tz = self.db.get_user_timezone(
+                current_tz = await self.db.get_user_timezone(
                     str(ctx.author.id), str(ctx.guild.id)
                 )
                 embed = discord.Embed(
@@ -448,7 +341,7 @@ class Settings(commands.Cog):
                         return
 
                     selected_timezone = select.values[0]
-                    if self.db.set_user_timezone(
+                    if await self.db.set_user_timezone(
                         str(ctx.author.id), str(ctx.guild.id), selected_timezone
                     ):
                         # Get current time in new timezone
@@ -491,7 +384,7 @@ class Settings(commands.Cog):
                 return
 
             # Set timezone
-            if self.db.set_user_timezone(str(ctx.author.id), str(ctx.guild.id), timezone_str):
+            if await self.db.set_user_timezone(str(ctx.author.id), str(ctx.guild.id), timezone_str):
                 embed = discord.Embed(
                     title="✅ Timezone Updated", color=discord.Color.green()
                 )
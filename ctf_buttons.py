@@ -0,0 +1,211 @@
+"""
+Persistent join/leave buttons for CTF competition announcements.
+The event ID is encoded in each button's custom_id, so the buttons keep
+working across restarts without any per-message state.
+"""
+
+import re
+
+import discord
+
+from database import get_async_database
+from roles import get_event_role
+
+
+class JoinButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"ctf:join:(?P<event_id>[^:]+)",
+):
+    """Join button for one CTF competition"""
+
+    def __init__(self, event_id: str):
+        super().__init__(
+            discord.ui.Button(
+                label="Join CTF",
+                style=discord.ButtonStyle.green,
+                emoji="✅",
+                custom_id=f"ctf:join:{event_id}",
+            )
+        )
+        self.event_id = event_id
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: re.Match[str],
+    ):
+        return cls(match["event_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        db = get_async_database()
+        try:
+            event = await db.get_event(self.event_id, str(interaction.guild_id))
+            if not event:
+                await interaction.response.send_message(
+                    "❌ Competition not found", ephemeral=True
+                )
+                return
+
+            # Check if user already joined
+            if await db.is_user_joined(
+                self.event_id, str(interaction.guild_id), str(interaction.user.id)
+            ):
+                await interaction.response.send_message(
+                    f"❌ You have already joined {event['name']}!", ephemeral=True
+                )
+                return
+
+            # Join competition
+            if await db.join_event(
+                self.event_id, str(interaction.guild_id), str(interaction.user.id)
+            ):
+                interaction.client.dispatch(
+                    "ctf_reminders_changed", self.event_id, str(interaction.guild_id)
+                )
+
+                # Find corresponding role
+                role = get_event_role(interaction.guild, event)
+
+                if role:
+                    try:
+                        await interaction.user.add_roles(role)
+                        success_msg = f"✅ Role added: {role.mention}"
+                    except discord.Forbidden:
+                        success_msg = "⚠️ Could not add role (missing permissions)"
+                    except Exception as e:
+                        success_msg = f"⚠️ Error adding role: {str(e)}"
+                else:
+                    success_msg = "⚠️ Role not found"
+
+                # DM the invite link if one is set
+                if event.get("invite_link"):
+                    try:
+                        # Send invite link via DM
+                        embed = discord.Embed(
+                            title="🔗 CTF Competition Invite Link",
+                            description=f"Competition: {event['name']}",
+                            color=discord.Color.blue(),
+                        )
+                        embed.add_field(
+                            name="Invite Link", value=event["invite_link"], inline=False
+                        )
+                        embed.add_field(
+                            name="Note",
+                            value="Please keep this link private and do not share it with non-participants.",
+                            inline=False,
+                        )
+                        await interaction.user.send(embed=embed)
+                        success_msg += "\n✉️ Invite link has been sent via DM"
+                    except discord.Forbidden:
+                        success_msg += "\n⚠️ Could not send invite link (DMs are closed)"
+
+                await interaction.response.send_message(
+                    f"✅ Successfully joined {event['name']}\n{success_msg}",
+                    ephemeral=True,
+                )
+            else:
+                await interaction.response.send_message(
+                    "❌ Error joining competition", ephemeral=True
+                )
+        except Exception as e:
+            await interaction.response.send_message(
+                f"❌ Error occurred: {str(e)}", ephemeral=True
+            )
+
+
+class LeaveButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"ctf:leave:(?P<event_id>[^:]+)",
+):
+    """Leave button for one CTF competition"""
+
+    def __init__(self, event_id: str):
+        super().__init__(
+            discord.ui.Button(
+                label="Leave CTF",
+                style=discord.ButtonStyle.red,
+                emoji="🚪",
+                custom_id=f"ctf:leave:{event_id}",
+            )
+        )
+        self.event_id = event_id
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: re.Match[str],
+    ):
+        return cls(match["event_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        db = get_async_database()
+        try:
+            event = await db.get_event(self.event_id, str(interaction.guild_id))
+            if not event:
+                await interaction.response.send_message(
+                    "❌ Competition not found", ephemeral=True
+                )
+                return
+
+            # Check if user has joined
+            if not await db.is_user_joined(
+                self.event_id, str(interaction.guild_id), str(interaction.user.id)
+            ):
+                await interaction.response.send_message(
+                    f"❌ You haven't joined {event['name']}!", ephemeral=True
+                )
+                return
+
+            # Leave competition
+            if await db.leave_event(
+                self.event_id, str(interaction.guild_id), str(interaction.user.id)
+            ):
+                interaction.client.dispatch(
+                    "ctf_reminders_changed", self.event_id, str(interaction.guild_id)
+                )
+
+                # Remove role
+                role = get_event_role(interaction.guild, event)
+
+                if role and role in interaction.user.roles:
+                    try:
+                        await interaction.user.remove_roles(role)
+                        success_msg = f"✅ Role removed: {role.mention}"
+                    except discord.Forbidden:
+                        success_msg = "⚠️ Could not remove role (missing permissions)"
+                    except Exception as e:
+                        success_msg = f"⚠️ Error removing role: {str(e)}"
+                else:
+                    success_msg = ""
+
+                await interaction.response.send_message(
+                    f"✅ Successfully left {event['name']}\n{success_msg}",
+                    ephemeral=True,
+                )
+            else:
+                await interaction.response.send_message(
+                    "❌ Error leaving competition", ephemeral=True
+                )
+        except Exception as e:
+            await interaction.response.send_message(
+                f"❌ Error occurred: {str(e)}", ephemeral=True
+            )
+
+
+class CTFButtons(discord.ui.View):
+    """Join and leave buttons attached to a competition announcement.
+
+    The view only lays out the buttons. It is stopped straight away so
+    sending it stores nothing per message; clicks are routed to the dynamic
+    items registered with add_dynamic_items.
+    """
+
+    def __init__(self, event_id: str):
+        super().__init__(timeout=None)  # Buttons will not timeout
+        self.add_item(JoinButton(event_id))
+        self.add_item(LeaveButton(event_id))
+        self.stop()
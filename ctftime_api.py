@@ -3,14 +3,25 @@ CTFtime API client for fetching competition and team information.
 This module provides a clean interface to interact with CTFtime's API and web scraping endpoints.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import aiohttp
-import requests
 from bs4 import BeautifulSoup
 
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional; team pages fall back to html.parser
+    lxml_html = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -19,12 +30,45 @@ BASE_URL = "https://ctftime.org"
 API_BASE_URL = f"{BASE_URL}/api/v1"
 DEFAULT_TIMEOUT = 30
 DEFAULT_RETRIES = 3
+DEFAULT_CONCURRENCY = 5
+
+# Event details cache settings
+EVENT_CACHE_SIZE = 512
+EVENT_CACHE_TTL = 6 * 60 * 60
+
+# Local mirror of upcoming events, synced window by window
+MIRROR_HORIZON = 120 * 24 * 60 * 60
+MIRROR_WINDOW = 14 * 24 * 60 * 60
+MIRROR_LIMIT = 100
+
+# Outbound rate limit for all CTFtime requests; the bot overrides the rate
+# from CTFTIME_REQUESTS_PER_SECOND at startup. The burst covers a whole team
+# import at DEFAULT_CONCURRENCY, so only sustained traffic is held to the rate.
+REQUESTS_PER_SECOND = 5.0
+REQUEST_BURST = 50
+
+# Retry backoff and circuit breaker settings
+BACKOFF_BASE = 1
+MAX_RETRY_DELAY = 30
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 120
+
+# Connection pool settings for the shared async client
+CONNECTION_LIMIT = 10
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
 
 # Custom headers to avoid rate limiting
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
+# Shared client session, kept open for the lifetime of the bot
+_session: Optional[aiohttp.ClientSession] = None
+
+# Requests currently in flight, keyed by (url, validators)
+_inflight: Dict[Tuple[str, "Validators"], asyncio.Task] = {}
+
 
 class CTFtimeError(Exception):
     """Base exception for CTFtime API errors."""
@@ -50,66 +94,540 @@ class CTFtimeParseError(CTFtimeError):
     pass
 
 
-async def _make_async_request(url: str, timeout: int = DEFAULT_TIMEOUT) -> Dict:
-    """Make an async request to CTFtime.
+class Validators(NamedTuple):
+    """HTTP cache validators returned with a CTFtime response."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class TeamPageVersion(NamedTuple):
+    """What the previous poll of a team page saw."""
+
+    validators: Validators = Validators()
+    digest: Optional[str] = None  # Hash of the events table section
+
+
+class EventCache:
+    """LRU cache of parsed event details with a time-to-live.
+
+    Entries are shared by every guild. When a store is set (an AsyncDatabase),
+    entries are also written to SQLite and read back on a memory miss, so a
+    restart does not start cold.
+    """
+
+    def __init__(
+        self, maxsize: int = EVENT_CACHE_SIZE, ttl: int = EVENT_CACHE_TTL, store=None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        # event_id -> (expires_epoch, event, validators)
+        self._entries = OrderedDict()
+
+    async def get(self, event_id: str) -> Optional[Dict]:
+        """Get cached event details, or None if missing or expired.
+
+        Args:
+            event_id: The CTFtime event ID
+
+        Returns:
+            Copy of the cached event dict or None
+        """
+        now = int(time.time())
+        entry = self._entries.get(event_id)
+        if entry is None and self.store is not None:
+            cached = await self.store.get_cached_event(event_id)
+            if cached:
+                entry = (
+                    cached["expires_epoch"],
+                    json.loads(cached["data"]),
+                    Validators(cached["etag"], cached["last_modified"]),
+                )
+                self._put(event_id, entry)
+
+        if entry is None or entry[0] <= now:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(event_id)
+        self.hits += 1
+        return dict(entry[1])
+
+    def stale(self, event_id: str) -> Optional[Tuple[Dict, Validators]]:
+        """Get an entry regardless of expiry, for revalidating with CTFtime.
+
+        Args:
+            event_id: The CTFtime event ID
+
+        Returns:
+            Tuple of (copy of the event dict, validators) or None
+        """
+        entry = self._entries.get(event_id)
+        if entry is None:
+            return None
+        return dict(entry[1]), entry[2]
+
+    async def set(
+        self, event_id: str, event: Dict, validators: Validators = Validators()
+    ):
+        """Cache event details for the configured time-to-live.
+
+        Args:
+            event_id: The CTFtime event ID
+            event: The parsed event dict
+            validators: Validators to revalidate the entry once it expires
+        """
+        expires_epoch = int(time.time()) + self.ttl
+        self._put(event_id, (expires_epoch, dict(event), validators))
+        if self.store is not None:
+            await self.store.cache_event(
+                event_id,
+                json.dumps(event),
+                expires_epoch,
+                validators.etag,
+                validators.last_modified,
+            )
+
+    def clear(self):
+        """Drop every in-memory entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _put(self, event_id: str, entry: tuple):
+        self._entries[event_id] = entry
+        self._entries.move_to_end(event_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Shared event details cache
+event_cache = EventCache()
+
+
+class TokenBucket:
+    """Token bucket limiting the rate of outbound requests.
+
+    Tokens refill at rate per second up to burst; each request takes one and
+    waits for a refill when the bucket is empty.
+    """
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, burst: int = REQUEST_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Shared limiter for every request to CTFtime
+rate_limiter = TokenBucket()
+
+
+class CircuitBreaker:
+    """Stops calling CTFtime for a while after repeated failures.
+
+    After threshold consecutive failed requests the circuit opens and calls
+    fail immediately. Once reset_timeout has passed a single trial request is
+    let through; its success closes the circuit again.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at = None
+        self._trial_at = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently being refused."""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Check whether a request may be sent now."""
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_timeout:
+            return False
+        # Half-open: one trial at a time, in case a trial never reports back
+        if self._trial_at is not None and now - self._trial_at < self.reset_timeout:
+            return False
+        self._trial_at = now
+        return True
+
+    def record_success(self):
+        """Close the circuit after a request got through."""
+        self.failures = 0
+        self._opened_at = None
+        self._trial_at = None
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit at the threshold."""
+        self.failures += 1
+        self._trial_at = None
+        if self._opened_at is not None or self.failures >= self.threshold:
+            self._opened_at = time.monotonic()
+
+
+# Shared breaker for every request to CTFtime
+circuit_breaker = CircuitBreaker()
+
+
+async def open_session() -> aiohttp.ClientSession:
+    """Open the shared CTFtime client session if it is not already open.
+
+    The session pools keep-alive connections and caches DNS lookups so
+    repeated calls reuse warm connections. It is opened lazily on first use,
+    but the bot opens it at startup and closes it on shutdown.
+
+    Returns:
+        The shared client session
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        )
+        _session = aiohttp.ClientSession(connector=connector, headers=HEADERS)
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared CTFtime client session."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def _fetch(
+    url: str,
+    validators: Optional[Validators] = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+) -> Tuple[Optional[str], Validators]:
+    """Make a conditional async request to CTFtime with retry logic.
+
+    Concurrent calls for the same URL and validators share one request, so
+    only one is in flight and every caller gets its result.
 
     Args:
         url: The URL to request
+        validators: Validators from an earlier response, sent as
+            If-None-Match/If-Modified-Since
         timeout: Request timeout in seconds
+        retries: Number of times to retry failed requests
 
     Returns:
-        Response data as dictionary
+        Tuple of (response body, validators), with a None body when CTFtime
+        answered 304 Not Modified
 
     Raises:
-        CTFtimeConnectionError: If connection fails
+        CTFtimeConnectionError: If connection fails after all retries
         CTFtimeAPIError: If API returns an error response
     """
-    async with aiohttp.ClientSession() as session:
+    validators = validators or Validators()
+    key = (url, validators)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_request(url, validators, timeout, retries))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _request_done(key, done))
+    # Shielded so one caller giving up does not cancel the others
+    return await asyncio.shield(task)
+
+
+def _request_done(key: Tuple[str, Validators], task: asyncio.Task):
+    """Forget a finished in-flight request."""
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # Mark as retrieved even if every caller gave up
+
+
+def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+    """Read a Retry-After header in seconds, or None if absent or invalid."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+async def _request(
+    url: str, validators: Validators, timeout: int, retries: int
+) -> Tuple[Optional[str], Validators]:
+    """Send a rate-limited request to CTFtime, retrying failures.
+
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    exponential backoff and full jitter, or after Retry-After when CTFtime
+    sends it. Other error responses are raised at once.
+    """
+    headers = {}
+    if validators.etag:
+        headers["If-None-Match"] = validators.etag
+    if validators.last_modified:
+        headers["If-Modified-Since"] = validators.last_modified
+
+    session = await open_session()
+    for attempt in range(retries):
+        if not circuit_breaker.allow():
+            raise CTFtimeConnectionError("CTFtime is unavailable, circuit is open")
+
+        await rate_limiter.acquire()
+        retry_after = None
         try:
-            async with session.get(url, headers=HEADERS, timeout=timeout) as response:
+            async with session.get(
+                url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                # A 304 may omit validators that have not changed
+                new_validators = Validators(
+                    response.headers.get("ETag", validators.etag),
+                    response.headers.get("Last-Modified", validators.last_modified),
+                )
+                if response.status == 304 and headers:
+                    circuit_breaker.record_success()
+                    return None, new_validators
                 if response.status == 200:
-                    return await response.json()
-                else:
-                    raise CTFtimeAPIError(f"API returned status code {response.status}")
+                    text = await response.text()
+                    circuit_breaker.record_success()
+                    return text, new_validators
+
+                error = CTFtimeAPIError(f"API returned status code {response.status}")
+                if response.status != 429 and response.status < 500:
+                    # CTFtime is up, the request itself is bad
+                    circuit_breaker.record_success()
+                    raise error
+                retry_after = _retry_after(response)
+        except asyncio.TimeoutError:
+            error = CTFtimeConnectionError("Connection to CTFtime timed out")
         except aiohttp.ClientError as e:
-            raise CTFtimeConnectionError(f"Failed to connect to CTFtime: {str(e)}")
+            error = CTFtimeConnectionError(f"Failed to connect to CTFtime: {str(e)}")
+
+        circuit_breaker.record_failure()
+        if attempt == retries - 1:
+            raise error
 
+        if retry_after is None:
+            delay = random.uniform(0, BACKOFF_BASE * 2**attempt)
+        else:
+            delay = retry_after
+        if delay > MAX_RETRY_DELAY:
+            raise error
+        logger.warning(f"Retrying {url} in {delay:.1f}s: {str(error)}")
+        await asyncio.sleep(delay)
 
-def _make_request(
-    url: str, timeout: int = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES
-) -> requests.Response:
-    """Make a request to CTFtime with retry logic.
+
+async def _make_async_request(url: str, timeout: int = DEFAULT_TIMEOUT) -> Dict:
+    """Make an async request to CTFtime.
 
     Args:
         url: The URL to request
         timeout: Request timeout in seconds
-        retries: Number of times to retry failed requests
 
     Returns:
-        Response object from requests
+        Response data as dictionary
 
     Raises:
-        CTFtimeConnectionError: If connection fails after all retries
+        CTFtimeConnectionError: If connection fails
         CTFtimeAPIError: If API returns an error response
+        CTFtimeParseError: If the response is not valid JSON
     """
-    for attempt in range(retries):
+    text, _ = await _fetch(url, timeout=timeout)
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise CTFtimeParseError(f"Invalid JSON from CTFtime: {str(e)}")
+
+
+def _parse_event(event: Dict, event_id: str) -> Optional[Dict]:
+    """Convert raw CTFtime event JSON into the event dict used by the bot.
+
+    Args:
+        event: Raw event data from the CTFtime API
+        event_id: The CTFtime event ID
+
+    Returns:
+        Dict containing event information or None if it has no start or end
+
+    Raises:
+        ValueError: If the start or end time is malformed
+    """
+    # Parse start and end times
+    start_time = event.get("start")
+    end_time = event.get("finish")
+
+    if not (start_time and end_time):
+        logger.warning(f"Event {event_id} missing start or end time")
+        return None
+
+    # Convert to ISO format with timezone
+    start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
+    end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
+
+    return {
+        "title": event.get("title", "Unknown"),
+        "description": event.get("description", "No description available"),
+        "start": start_dt.isoformat(),
+        "finish": end_dt.isoformat(),
+        "url": event.get("url", ""),
+        "ctftime_url": event.get("ctftime_url", f"{BASE_URL}/event/{event_id}"),
+        "format": event.get("format", "Unknown"),
+        "weight": float(event.get("weight", 0)),
+        "location": event.get("location", "Online"),
+        "id": event_id,
+    }
+
+
+def _to_epoch(iso_time: str) -> int:
+    """Convert a CTFtime ISO timestamp to epoch seconds."""
+    return int(datetime.fromisoformat(iso_time.replace("Z", "+00:00")).timestamp())
+
+
+class EventMirror:
+    """Local SQLite mirror of upcoming CTFtime events.
+
+    sync() walks the public events feed from now to MIRROR_HORIZON in
+    MIRROR_WINDOW steps, replacing each window in the store (an
+    AsyncDatabase). Lookups need no network, so they keep working while
+    CTFtime is down.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+
+    async def get(self, event_id: str) -> Optional[Dict]:
+        """Get a mirrored event, or None if it is not mirrored.
+
+        Args:
+            event_id: The CTFtime event ID
+
+        Returns:
+            Dict containing event information or None
+        """
+        if self.store is None:
+            return None
+        data = await self.store.get_mirrored_event(event_id)
+        if not data:
+            return None
         try:
-            response = requests.get(url, headers=HEADERS, timeout=timeout)
-            response.raise_for_status()
-            return response
-        except requests.Timeout:
-            if attempt == retries - 1:
-                raise CTFtimeConnectionError("Connection to CTFtime timed out")
-            continue
-        except requests.RequestException as e:
-            if attempt == retries - 1:
-                raise CTFtimeConnectionError(f"Failed to connect to CTFtime: {str(e)}")
-            continue
+            return _parse_event(json.loads(data), event_id)
+        except ValueError as e:
+            logger.error(f"Error reading mirrored event {event_id}: {str(e)}")
+            return None
+
+    async def upcoming(self, limit: int) -> List[Dict]:
+        """Get raw data of mirrored events that have not finished yet.
+
+        Args:
+            limit: Maximum number of events to return
+
+        Returns:
+            List of raw event dicts ordered by start time
+        """
+        rows = await self.store.get_mirrored_events(int(time.time()), limit)
+        return [json.loads(data) for data in rows]
+
+    async def sync(self, now_epoch: Optional[int] = None) -> int:
+        """Refresh the mirror from the CTFtime events feed.
+
+        Args:
+            now_epoch: Current time, defaults to now
+
+        Returns:
+            Number of events stored
+        """
+        if self.store is None:
+            return 0
+        if now_epoch is None:
+            now_epoch = int(time.time())
+
+        await self.store.delete_finished_mirror_events(now_epoch)
+        stored = 0
+        start = now_epoch
+        end = now_epoch + MIRROR_HORIZON
+        while start < end:
+            finish = min(start + MIRROR_WINDOW, end)
+            try:
+                events = await _make_async_request(
+                    f"{API_BASE_URL}/events/"
+                    f"?limit={MIRROR_LIMIT}&start={start}&finish={finish}"
+                )
+            except CTFtimeError as e:
+                logger.error(f"Error syncing events mirror: {str(e)}")
+                break
+
+            rows = []
+            for event in events:
+                try:
+                    row = (
+                        str(event["id"]),
+                        json.dumps(event),
+                        _to_epoch(event["start"]),
+                        _to_epoch(event["finish"]),
+                    )
+                except (KeyError, AttributeError, ValueError):
+                    continue
+                rows.append(row)
+
+            if len(events) >= MIRROR_LIMIT and rows:
+                # The window was truncated, so it is only complete up to the
+                # last start time returned; continue from there
+                finish = max(start + 1, max(row[2] for row in rows))
+                rows = [row for row in rows if row[2] < finish]
+
+            if not await self.store.replace_mirror_window(start, finish, rows):
+                break
+            stored += len(rows)
+            start = finish
+
+        return stored
+
+
+# Shared mirror of upcoming events
+event_mirror = EventMirror()
 
 
 async def get_event(event_id: str) -> Optional[Dict]:
     """Get detailed information about a specific CTF event.
 
+    Mirrored upcoming events and fresh results in the shared event cache are
+    served without a network request.
+
     Args:
         event_id: The CTFtime event ID
 
@@ -119,94 +637,282 @@ async def get_event(event_id: str) -> Optional[Dict]:
     Raises:
         CTFtimeError: If there's any error fetching or parsing the event
     """
-    try:
-        event = await _make_async_request(f"{API_BASE_URL}/events/{event_id}/")
+    mirrored = await event_mirror.get(event_id)
+    if mirrored is not None:
+        return mirrored
 
-        # Parse start and end times
-        start_time = event.get("start")
-        end_time = event.get("finish")
+    cached = await event_cache.get(event_id)
+    if cached is not None:
+        return cached
 
-        if not (start_time and end_time):
-            logger.warning(f"Event {event_id} missing start or end time")
+    # An expired entry can be revalidated instead of downloaded again
+    stale = event_cache.stale(event_id)
+    try:
+        text, validators = await _fetch(
+            f"{API_BASE_URL}/events/{event_id}/",
+            stale[1] if stale else None,
+        )
+        if text is None:
+            await event_cache.set(event_id, stale[0], validators)
+            return stale[0]
+
+        event_info = _parse_event(json.loads(text), event_id)
+        if event_info is None:
             return None
-
-        # Convert to ISO format with timezone
-        start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-        end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
-
-        return {
-            "title": event.get("title", "Unknown"),
-            "description": event.get("description", "No description available"),
-            "start": start_dt.isoformat(),
-            "finish": end_dt.isoformat(),
-            "url": event.get("url", ""),
-            "ctftime_url": event.get("ctftime_url", f"{BASE_URL}/event/{event_id}"),
-            "format": event.get("format", "Unknown"),
-            "weight": float(event.get("weight", 0)),
-            "location": event.get("location", "Online"),
-            "id": event_id,
-        }
+        await event_cache.set(event_id, event_info, validators)
+        return event_info
 
     except (CTFtimeError, ValueError, KeyError) as e:
         logger.error(f"Error getting event {event_id}: {str(e)}")
         return None
 
 
-def get_team_events(team_id: str) -> List[Dict]:
-    """Get a list of events that a team is planning to participate in.
+async def get_events(
+    event_ids: List[str], concurrency: int = DEFAULT_CONCURRENCY
+) -> List[Optional[Dict]]:
+    """Get detailed information about several CTF events in parallel.
+
+    At most concurrency requests are in flight at once. A failure for one
+    event does not affect the others.
 
     Args:
-        team_id: The CTFtime team ID
+        event_ids: The CTFtime event IDs
+        concurrency: Maximum number of concurrent requests
+
+    Returns:
+        List of event dicts in the same order as event_ids, with None for
+        events that could not be fetched
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(event_id: str) -> Optional[Dict]:
+        async with semaphore:
+            return await get_event(event_id)
+
+    results = await asyncio.gather(
+        *(fetch(event_id) for event_id in event_ids), return_exceptions=True
+    )
+    events = []
+    for event_id, result in zip(event_ids, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error getting event {event_id}: {str(result)}")
+            result = None
+        events.append(result)
+    return events
+
+
+def _table_section(html: str) -> str:
+    """Cut the first table, the one that is parsed, out of a team page.
+
+    Args:
+        html: The team page HTML
+
+    Returns:
+        Everything from the first <table> to its matching </table>, or an
+        empty string if the page has no complete table
+    """
+    start = html.find("<table")
+    if start == -1:
+        return ""
+
+    # Track nesting so a table inside the events table cannot end it early
+    depth = 0
+    pos = start
+    while True:
+        next_open = html.find("<table", pos)
+        next_close = html.find("</table>", pos)
+        if next_close == -1:
+            return ""
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            pos = next_open + len("<table")
+        else:
+            depth -= 1
+            pos = next_close + len("</table>")
+            if depth == 0:
+                return html[start:pos]
+
+
+def _parse_team_events_lxml(section: str) -> List[Dict]:
+    """Parse the planned events out of a table section with lxml.
+
+    Args:
+        section: The table section of a team page
 
     Returns:
         List of dicts containing event information
+    """
+    events = []
+    table = next(lxml_html.fromstring(section).iter("table"))
 
-    Raises:
-        CTFtimeError: If there's any error fetching or parsing team events
+    for row in list(table.iter("tr"))[1:]:  # Skip header row
+        cols = list(row.iter("td"))
+        if len(cols) < 2:
+            continue
+
+        event_link = next(cols[0].iter("a"), None)
+        if event_link is None or not event_link.get("href"):
+            continue
+
+        event_url = event_link.get("href")
+        events.append(
+            {
+                "title": event_link.text_content().strip(),
+                "date": cols[1].text_content().strip(),
+                "url": f"{BASE_URL}{event_url}",
+                "id": event_url.split("/")[-1],
+            }
+        )
+
+    return events
+
+
+def _parse_team_events(html: str, team_id: str) -> List[Dict]:
+    """Parse the planned events table out of a team page.
+
+    Only the table section is parsed, with lxml when it is installed. The
+    full page is parsed with html.parser if lxml is missing or fails.
+
+    Args:
+        html: The team page HTML
+        team_id: The CTFtime team ID, used for logging
+
+    Returns:
+        List of dicts containing event information
     """
-    try:
-        response = _make_request(f"{BASE_URL}/team/{team_id}")
-        soup = BeautifulSoup(response.text, "html.parser")
+    section = _table_section(html)
+    if not section:
+        logger.warning(f"No events table found for team {team_id}")
+        return []
 
-        events = []
-        table = soup.find("table")
-        if not table:
-            logger.warning(f"No events table found for team {team_id}")
-            return events
+    if lxml_html is not None:
+        try:
+            return _parse_team_events_lxml(section)
+        except Exception as e:
+            logger.warning(f"lxml failed to parse team {team_id} page: {str(e)}")
 
-        for row in table.find_all("tr")[1:]:  # Skip header row
-            cols = row.find_all("td")
-            if len(cols) < 2:
-                continue
-
-            event_link = cols[0].find("a")
-            if not event_link:
-                continue
-
-            event_title = event_link.text.strip()
-            event_url = event_link["href"]
-            event_id = event_url.split("/")[-1]
-            event_date = cols[1].text.strip()
-
-            events.append(
-                {
-                    "title": event_title,
-                    "date": event_date,
-                    "url": f"{BASE_URL}{event_url}",
-                    "id": event_id,
-                }
-            )
+    return _parse_team_events_soup(html)
 
+
+def _parse_team_events_soup(html: str) -> List[Dict]:
+    """Parse the planned events out of a full team page with html.parser.
+
+    Args:
+        html: The team page HTML
+
+    Returns:
+        List of dicts containing event information
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    events = []
+    table = soup.find("table")
+    if not table:
         return events
 
+    for row in table.find_all("tr")[1:]:  # Skip header row
+        cols = row.find_all("td")
+        if len(cols) < 2:
+            continue
+
+        event_link = cols[0].find("a")
+        if not event_link or not event_link.get("href"):
+            continue
+
+        event_title = event_link.text.strip()
+        event_url = event_link["href"]
+        event_id = event_url.split("/")[-1]
+        event_date = cols[1].text.strip()
+
+        events.append(
+            {
+                "title": event_title,
+                "date": event_date,
+                "url": f"{BASE_URL}{event_url}",
+                "id": event_id,
+            }
+        )
+
+    return events
+
+
+def _table_digest(html: str) -> str:
+    """Hash the events table of a team page.
+
+    Other tables on the page are left out, so changes to them do not count
+    as a change to the planned events.
+
+    Args:
+        html: The team page HTML
+
+    Returns:
+        Hex digest of the events table
+    """
+    return hashlib.sha256(_table_section(html).encode()).hexdigest()
+
+
+async def poll_team_events(
+    team_id: str, version: Optional[TeamPageVersion] = None
+) -> Tuple[Optional[List[Dict]], Optional[TeamPageVersion]]:
+    """Get a team's planned events unless the team page is unchanged.
+
+    The caller keeps the returned version and passes it back on the next
+    poll. The page counts as unchanged when CTFtime answers 304 Not Modified
+    or when the hash of its table section matches the previous poll; then
+    nothing is parsed and None is returned in place of the events.
+
+    Args:
+        team_id: The CTFtime team ID
+        version: Version returned by the previous poll of this team
+
+    Returns:
+        Tuple of (list of event dicts or None if unchanged, new version). If
+        the page could not be fetched, the version is None and the events
+        list is empty.
+    """
+    version = version or TeamPageVersion()
+    try:
+        html, validators = await _fetch(
+            f"{BASE_URL}/team/{team_id}", version.validators
+        )
+        if html is None:
+            return None, version._replace(validators=validators)
+
+        digest = _table_digest(html)
+        new_version = TeamPageVersion(validators, digest)
+        if digest == version.digest:
+            return None, new_version
+
+        events = await asyncio.to_thread(_parse_team_events, html, team_id)
+        return events, new_version
+
     except CTFtimeError as e:
         logger.error(f"Error getting team events for team {team_id}: {str(e)}")
-        return []
+        return [], None
+
+
+async def get_team_events(team_id: str) -> List[Dict]:
+    """Get a list of events that a team is planning to participate in.
 
+    The page is fetched on the shared session and parsed in a worker thread,
+    so a slow or large team page never blocks the event loop.
 
-def get_upcoming_events(limit: int = 100) -> List[Dict]:
+    Args:
+        team_id: The CTFtime team ID
+
+    Returns:
+        List of dicts containing event information
+    """
+    events, _ = await poll_team_events(team_id)
+    return events
+
+
+async def get_upcoming_events(limit: int = 100) -> List[Dict]:
     """Get a list of upcoming CTF events.
 
+    Served from the local mirror when it has events, otherwise fetched from
+    CTFtime.
+
     Args:
         limit: Maximum number of events to return
 
@@ -216,10 +922,15 @@ def get_upcoming_events(limit: int = 100) -> List[Dict]:
     Raises:
         CTFtimeError: If there's any error fetching or parsing events
     """
+    if event_mirror.store is not None:
+        events = await event_mirror.upcoming(limit)
+        if events:
+            return events
+
     try:
-        response = _make_request(f"{API_BASE_URL}/events/")
-        events = response.json()
-        return events[:limit]
+        return await _make_async_request(
+            f"{API_BASE_URL}/events/?limit={limit}&start={int(time.time())}"
+        )
     except CTFtimeError as e:
         logger.error(f"Error getting upcoming events: {str(e)}")
         return []
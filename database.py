@@ -1,140 +1,412 @@
+import asyncio
+import functools
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+# Number of long-lived read-only connections kept per database file
+READER_POOL_SIZE = 4
+
+# Database methods with these prefixes only read and may run concurrently
+READ_METHOD_PREFIXES = ("get_", "is_")
+
+# ctf_events columns returned for an event, in dict key order
+EVENT_FIELDS = (
+    "event_id",
+    "guild_id",
+    "name",
+    "start_time",
+    "end_time",
+    "event_type",
+    "weight",
+    "location",
+    "official_url",
+    "ctftime_url",
+    "invite_link",
+    "added_time",
+    "added_by",
+    "start_epoch",
+    "end_epoch",
+    "role_id",
+)
+EVENT_COLUMNS = ", ".join(f"e.{field}" for field in EVENT_FIELDS)
+
+
+class ConnectionPool:
+    """Long-lived SQLite connections for a single database file.
+
+    Writes are serialized through one writer connection, reads borrow one of
+    a small set of reader connections. WAL journaling lets readers run while
+    the writer holds a transaction.
+    """
+
+    def __init__(self, db_file: str, readers: int = READER_POOL_SIZE):
+        self.db_file = db_file
+        self.initialized = False  # Set once the schema has been checked
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._readers = queue.Queue()
+        for _ in range(readers):
+            self._readers.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for shared, multi-threaded use"""
+        conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """Borrow the writer connection, holding the write lock"""
+        with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                # Uncommitted work is discarded, just like closing a connection
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+
+    @contextmanager
+    def reader(self):
+        """Borrow a reader connection from the pool"""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    def close(self):
+        """Close every connection held by the pool"""
+        with self._write_lock:
+            self._writer.close()
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_databases = {}
+_databases_lock = threading.Lock()
+_async_databases = {}
+
+
+def to_epoch(iso_time: str) -> int:
+    """Convert an ISO 8601 time to UTC epoch seconds, treating naive times as UTC"""
+    dt = datetime.fromisoformat(iso_time)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _event_from_row(row) -> dict:
+    """Build an event dict from a row selected with EVENT_COLUMNS"""
+    return dict(zip(EVENT_FIELDS, row))
+
+
+def get_pool(db_file: str) -> ConnectionPool:
+    """Get the process-wide connection pool for a database file"""
+    with _pools_lock:
+        pool = _pools.get(db_file)
+        if pool is None:
+            pool = _pools[db_file] = ConnectionPool(db_file)
+        return pool
+
+
+def close_pools():
+    """Close all connection pools and database executors, e.g. on shutdown"""
+    with _databases_lock:
+        for async_db in _async_databases.values():
+            async_db.close()
+        _async_databases.clear()
+        _databases.clear()
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def get_database(db_file: str = "ctf_events.db") -> "Database":
+    """Get the shared Database for a file, creating it on first use"""
+    with _databases_lock:
+        db = _databases.get(db_file)
+        if db is None:
+            db = _databases[db_file] = Database(db_file)
+        return db
+
+
+def get_async_database(db_file: str = "ctf_events.db") -> "AsyncDatabase":
+    """Get the shared AsyncDatabase for a file, creating it on first use"""
+    db = get_database(db_file)
+    with _databases_lock:
+        async_db = _async_databases.get(db_file)
+        if async_db is None:
+            async_db = _async_databases[db_file] = AsyncDatabase(db)
+        return async_db
+
+
+def _migrate_initial_schema(c: sqlite3.Cursor):
+    """Create the base tables, upgrading databases from before versioning"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS ctf_events (
+            event_id TEXT,
+            guild_id TEXT,
+            name TEXT NOT NULL,
+            start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            event_type TEXT,
+            weight REAL,
+            location TEXT,
+            official_url TEXT,
+            ctftime_url TEXT,
+            invite_link TEXT,
+            added_time TEXT NOT NULL,
+            added_by TEXT,
+            PRIMARY KEY (event_id, guild_id)
+        )
+    """)
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS guild_settings (
+            guild_id TEXT PRIMARY KEY,
+            notification_channel_id TEXT,
+            ctftime_team_id TEXT
+        )
+    """)
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS event_participants (
+            event_id TEXT,
+            guild_id TEXT,
+            user_id TEXT,
+            join_time TEXT NOT NULL,
+            PRIMARY KEY (event_id, guild_id, user_id),
+            FOREIGN KEY (event_id, guild_id) REFERENCES ctf_events (event_id, guild_id)
+        )
+    """)
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS reminder_settings (
+            event_id TEXT,
+            guild_id TEXT,
+            user_id TEXT,
+            before_start TEXT,
+            before_end TEXT,
+            PRIMARY KEY (event_id, guild_id, user_id),
+            FOREIGN KEY (event_id, guild_id) REFERENCES ctf_events (event_id, guild_id)
+        )
+    """)
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS user_timezones (
+            user_id TEXT,
+            guild_id TEXT,
+            timezone TEXT NOT NULL,
+            updated_time TEXT NOT NULL,
+            PRIMARY KEY (user_id, guild_id)
+        )
+    """)
+
+    # Unversioned databases may predate these columns
+    for table, column in (
+        ("guild_settings", "ctftime_team_id"),
+        ("ctf_events", "invite_link"),
+        ("ctf_events", "added_by"),
+    ):
+        c.execute(f"PRAGMA table_info({table})")
+        if column not in [info[1] for info in c.fetchall()]:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+
+
+def _migrate_lookup_indexes(c: sqlite3.Cursor):
+    """Add covering indexes for the participant, listing and timezone lookups"""
+    # get_user_events filters participants by guild and user
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_participants_guild_user
+        ON event_participants (guild_id, user_id, event_id)
+    """)
+    # get_event_participants returns participants in join order
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_participants_event_join
+        ON event_participants (event_id, guild_id, join_time, user_id)
+    """)
+    # get_all_events lists a guild's events ordered by start time
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_guild_start
+        ON ctf_events (guild_id, start_time)
+    """)
+
+
+def _migrate_event_epochs(c: sqlite3.Cursor):
+    """Add indexed UTC epoch columns for event start and end times"""
+    c.execute("ALTER TABLE ctf_events ADD COLUMN start_epoch INTEGER")
+    c.execute("ALTER TABLE ctf_events ADD COLUMN end_epoch INTEGER")
+
+    c.execute("SELECT rowid, start_time, end_time FROM ctf_events")
+    for rowid, start_time, end_time in c.fetchall():
+        try:
+            epochs = (to_epoch(start_time), to_epoch(end_time))
+        except (TypeError, ValueError):
+            # Leave unparseable times NULL rather than failing the upgrade
+            continue
+        c.execute(
+            "UPDATE ctf_events SET start_epoch = ?, end_epoch = ? WHERE rowid = ?",
+            (*epochs, rowid),
+        )
+
+    c.execute("DROP INDEX IF EXISTS idx_events_guild_start")
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_guild_start_epoch
+        ON ctf_events (guild_id, start_epoch)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_start_epoch
+        ON ctf_events (start_epoch)
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_events_end_epoch
+        ON ctf_events (end_epoch)
+    """)
+
+
+def _migrate_reminder_outbox(c: sqlite3.Cursor):
+    """Add the outbox that records scheduled and delivered reminders"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS reminder_outbox (
+            event_id TEXT,
+            guild_id TEXT,
+            user_id TEXT,
+            reminder TEXT,
+            fire_epoch INTEGER NOT NULL,
+            sent_epoch INTEGER,
+            PRIMARY KEY (event_id, guild_id, user_id, reminder)
+        )
+    """)
+
+
+def _migrate_event_cache(c: sqlite3.Cursor):
+    """Add the persistent cache of CTFtime event details"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS ctftime_event_cache (
+            event_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_epoch INTEGER NOT NULL
+        )
+    """)
+
+
+def _migrate_event_cache_validators(c: sqlite3.Cursor):
+    """Keep HTTP validators with cached events so they can be revalidated"""
+    c.execute("ALTER TABLE ctftime_event_cache ADD COLUMN etag TEXT")
+    c.execute("ALTER TABLE ctftime_event_cache ADD COLUMN last_modified TEXT")
+
+
+def _migrate_event_mirror(c: sqlite3.Cursor):
+    """Add the local mirror of upcoming CTFtime events"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS ctftime_mirror (
+            event_id TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            start_epoch INTEGER NOT NULL,
+            finish_epoch INTEGER NOT NULL
+        )
+    """)
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_mirror_start ON ctftime_mirror (start_epoch)"
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_mirror_finish ON ctftime_mirror (finish_epoch)"
+    )
+
+
+def _migrate_team_poll_state(c: sqlite3.Cursor):
+    """Add the per-team polling schedule and last seen team page version"""
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS team_poll_state (
+            team_id TEXT PRIMARY KEY,
+            guild_ids TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            digest TEXT,
+            poll_interval INTEGER NOT NULL,
+            next_poll_epoch INTEGER NOT NULL
+        )
+    """)
+
+
+def _migrate_event_role_ids(c: sqlite3.Cursor):
+    """Add the Discord role ID of each event's role"""
+    # Existing rows are backfilled by role name once the bot sees its guilds
+    c.execute("ALTER TABLE ctf_events ADD COLUMN role_id TEXT")
+
+
+# Ordered schema migrations; PRAGMA user_version counts how many have run
+MIGRATIONS = [
+    _migrate_initial_schema,
+    _migrate_lookup_indexes,
+    _migrate_event_epochs,
+    _migrate_reminder_outbox,
+    _migrate_event_cache,
+    _migrate_event_cache_validators,
+    _migrate_event_mirror,
+    _migrate_team_poll_state,
+    _migrate_event_role_ids,
+]
 
 
 class Database:
     def __init__(self, db_file="ctf_events.db"):
         self.db_file = db_file
-        self.init_db()
+        self.pool = get_pool(db_file)
+        # The schema only needs to be checked once per database file
+        if not self.pool.initialized:
+            self.init_db()
 
     def init_db(self):
-        """Initialize database tables"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-
-        # Check if database migration is needed
-        c.execute("PRAGMA table_info(ctf_events)")
-        columns = [column[1] for column in c.fetchall()]
-
-        # Create CTF events table
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS ctf_events (
-                event_id TEXT,
-                guild_id TEXT,
-                name TEXT NOT NULL,
-                start_time TEXT NOT NULL,
-                end_time TEXT NOT NULL,
-                event_type TEXT,
-                weight REAL,
-                location TEXT,
-                official_url TEXT,
-                ctftime_url TEXT,
-                invite_link TEXT,
-                added_time TEXT NOT NULL,
-                added_by TEXT,
-                PRIMARY KEY (event_id, guild_id)
-            )
-        """)
-
-        # Create guild_settings table
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS guild_settings (
-                guild_id TEXT PRIMARY KEY,
-                notification_channel_id TEXT,
-                ctftime_team_id TEXT
-            )
-        """)
-
-        # Check if guild_settings table has ctftime_team_id column
-        c.execute("PRAGMA table_info(guild_settings)")
-        guild_settings_columns = [column[1] for column in c.fetchall()]
-        if "ctftime_team_id" not in guild_settings_columns:
-            try:
-                c.execute("ALTER TABLE guild_settings ADD COLUMN ctftime_team_id TEXT")
+        """Bring the schema up to date by applying pending migrations"""
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            c.execute("PRAGMA user_version")
+            if c.fetchone()[0] < len(MIGRATIONS):
+                # Take the write lock before re-reading the version so two
+                # processes cannot apply the same migration
+                c.execute("BEGIN IMMEDIATE")
+                c.execute("PRAGMA user_version")
+                version = c.fetchone()[0]
+                for migrate in MIGRATIONS[version:]:
+                    migrate(c)
+                c.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
                 conn.commit()
-            except sqlite3.OperationalError:
-                # Column might already exist, ignore error
-                pass
-
-        # If table exists but doesn't have invite_link column, add it
-        if "invite_link" not in columns:
-            try:
-                c.execute("ALTER TABLE ctf_events ADD COLUMN invite_link TEXT")
-                conn.commit()
-            except sqlite3.OperationalError:
-                # Column might already exist, ignore error
-                pass
-
-        # If table exists but doesn't have added_by column, add it
-        if "added_by" not in columns:
-            try:
-                c.execute("ALTER TABLE ctf_events ADD COLUMN added_by TEXT")
-                conn.commit()
-            except sqlite3.OperationalError:
-                # Column might already exist, ignore error
-                pass
-
-        # Create event participants table
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS event_participants (
-                event_id TEXT,
-                guild_id TEXT,
-                user_id TEXT,
-                join_time TEXT NOT NULL,
-                PRIMARY KEY (event_id, guild_id, user_id),
-                FOREIGN KEY (event_id, guild_id) REFERENCES ctf_events (event_id, guild_id)
-            )
-        """)
-
-        # Create reminder_settings table
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS reminder_settings (
-                event_id TEXT,
-                guild_id TEXT,
-                user_id TEXT,
-                before_start TEXT,
-                before_end TEXT,
-                PRIMARY KEY (event_id, guild_id, user_id),
-                FOREIGN KEY (event_id, guild_id) REFERENCES ctf_events (event_id, guild_id)
-            )
-        """)
-
-        # Create user timezones table
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS user_timezones (
-                user_id TEXT,
-                guild_id TEXT,
-                timezone TEXT NOT NULL,
-                updated_time TEXT NOT NULL,
-                PRIMARY KEY (user_id, guild_id)
-            )
-        """)
 
-        conn.commit()
-        conn.close()
+            self.pool.initialized = True
 
     def add_guild(self, guild_id: str) -> bool:
         """Add a new guild to the database with default settings"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            # Insert guild with default settings (NULL values for optional fields)
-            c.execute(
-                """
-                INSERT OR IGNORE INTO guild_settings 
-                (guild_id, notification_channel_id, ctftime_team_id)
-                VALUES (?, NULL, NULL)
-                """,
-                (guild_id,),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error adding guild {guild_id}: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                # Insert guild with default settings (NULL values for optional fields)
+                c.execute(
+                    """
+                    INSERT OR IGNORE INTO guild_settings 
+                    (guild_id, notification_channel_id, ctftime_team_id)
+                    VALUES (?, NULL, NULL)
+                    """,
+                    (guild_id,),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error adding guild {guild_id}: {e}")
+                return False
 
     def add_event(
         self,
@@ -151,422 +423,500 @@ class Database:
         added_by: str,
     ) -> bool:
         """Add a new CTF event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                INSERT INTO ctf_events (
-                    event_id, guild_id, name, start_time, end_time,
-                    event_type, weight, location, official_url, ctftime_url,
-                    invite_link, added_time, added_by
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event_id,
-                    guild_id,
-                    name,
-                    start_time,
-                    end_time,
-                    event_type,
-                    weight,
-                    location,
-                    official_url,
-                    ctftime_url,
-                    "",  # Empty invite link
-                    datetime.now().isoformat(),  # Current time as added time
-                    added_by,  # Adder's ID
-                ),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error adding event: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    """
+                    INSERT INTO ctf_events (
+                        event_id, guild_id, name, start_time, end_time,
+                        event_type, weight, location, official_url, ctftime_url,
+                        invite_link, added_time, added_by, start_epoch, end_epoch
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        event_id,
+                        guild_id,
+                        name,
+                        start_time,
+                        end_time,
+                        event_type,
+                        weight,
+                        location,
+                        official_url,
+                        ctftime_url,
+                        "",  # Empty invite link
+                        datetime.now().isoformat(),  # Current time as added time
+                        added_by,  # Adder's ID
+                        to_epoch(start_time),
+                        to_epoch(end_time),
+                    ),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error adding event: {e}")
+                return False
 
     def join_event(self, event_id: str, guild_id: str, user_id: str) -> bool:
         """Join an event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            # Check if event exists
-            c.execute(
-                "SELECT 1 FROM ctf_events WHERE event_id = ? AND guild_id = ?",
-                (event_id, guild_id),
-            )
-            if not c.fetchone():
-                return False
+            try:
+                # Check if event exists
+                c.execute(
+                    "SELECT 1 FROM ctf_events WHERE event_id = ? AND guild_id = ?",
+                    (event_id, guild_id),
+                )
+                if not c.fetchone():
+                    return False
 
-            # Check if user already joined
-            c.execute(
-                "SELECT 1 FROM event_participants WHERE event_id = ? AND guild_id = ? AND user_id = ?",
-                (event_id, guild_id, user_id),
-            )
-            if c.fetchone():
-                return True  # User already joined, return success
+                # Check if user already joined
+                c.execute(
+                    "SELECT 1 FROM event_participants WHERE event_id = ? AND guild_id = ? AND user_id = ?",
+                    (event_id, guild_id, user_id),
+                )
+                if c.fetchone():
+                    return True  # User already joined, return success
 
-            # Add user participation record
-            c.execute(
-                """
-                INSERT INTO event_participants 
-                (event_id, guild_id, user_id, join_time)
-                VALUES (?, ?, ?, ?)
-                """,
-                (event_id, guild_id, user_id, datetime.now().isoformat()),
-            )
+                # Add user participation record
+                c.execute(
+                    """
+                    INSERT INTO event_participants 
+                    (event_id, guild_id, user_id, join_time)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (event_id, guild_id, user_id, datetime.now().isoformat()),
+                )
 
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error joining event: {e}")
-            return False
-        finally:
-            conn.close()
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error joining event: {e}")
+                return False
 
     def leave_event(self, event_id: str, guild_id: str, user_id: str) -> bool:
         """Leave an event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                DELETE FROM event_participants 
-                WHERE event_id = ? AND guild_id = ? AND user_id = ?
-                """,
-                (event_id, guild_id, user_id),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error leaving event: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    """
+                    DELETE FROM event_participants 
+                    WHERE event_id = ? AND guild_id = ? AND user_id = ?
+                    """,
+                    (event_id, guild_id, user_id),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error leaving event: {e}")
+                return False
 
     def get_event_participants(self, event_id: str, guild_id: str) -> list:
         """Get all participants of an event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        c.execute(
-            """
-            SELECT user_id, join_time 
-            FROM event_participants 
-            WHERE event_id = ? AND guild_id = ?
-            ORDER BY join_time
-        """,
-            (event_id, guild_id),
-        )
+            c.execute(
+                """
+                SELECT user_id, join_time 
+                FROM event_participants 
+                WHERE event_id = ? AND guild_id = ?
+                ORDER BY join_time
+            """,
+                (event_id, guild_id),
+            )
 
-        participants = c.fetchall()
-        conn.close()
+            participants = c.fetchall()
 
-        return [{"user_id": p[0], "join_time": p[1]} for p in participants]
+            return [{"user_id": p[0], "join_time": p[1]} for p in participants]
 
     def get_user_events(self, guild_id: str, user_id: str) -> list:
         """Get all events a user is participating in"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        c.execute(
-            """
-            SELECT e.* 
-            FROM ctf_events e
-            JOIN event_participants p ON e.event_id = p.event_id AND e.guild_id = p.guild_id
-            WHERE p.guild_id = ? AND p.user_id = ?
-            ORDER BY e.start_time
-        """,
-            (guild_id, user_id),
-        )
+            c.execute(
+                f"""
+                SELECT {EVENT_COLUMNS}
+                FROM event_participants p
+                CROSS JOIN ctf_events e ON e.event_id = p.event_id AND e.guild_id = p.guild_id
+                WHERE p.guild_id = ? AND p.user_id = ?
+                ORDER BY e.start_epoch
+            """,
+                (guild_id, user_id),
+            )
+
+            events = c.fetchall()
 
-        events = c.fetchall()
-        conn.close()
-
-        return [
-            {
-                "event_id": event[0],
-                "guild_id": event[1],
-                "name": event[2],
-                "start_time": event[3],
-                "end_time": event[4],
-                "event_type": event[5],
-                "weight": event[6],
-                "location": event[7],
-                "official_url": event[8],
-                "ctftime_url": event[9],
-                "invite_link": event[10],
-                "added_time": event[11],
-                "added_by": event[12] if len(event) >= 13 else None,
-            }
-            for event in events
-        ]
+            return [_event_from_row(event) for event in events]
 
     def get_event(self, event_id: str, guild_id: str):
         """Get event by ID"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                "SELECT * FROM ctf_events WHERE event_id = ? AND guild_id = ?",
-                (event_id, guild_id),
-            )
-            event = c.fetchone()
+            try:
+                c.execute(
+                    f"SELECT {EVENT_COLUMNS} FROM ctf_events e WHERE event_id = ? AND guild_id = ?",
+                    (event_id, guild_id),
+                )
+                event = c.fetchone()
 
-            if event:
-                # Check number of returned fields
-                return {
-                    "event_id": event[0],
-                    "guild_id": event[1],
-                    "name": event[2],
-                    "start_time": event[3],
-                    "end_time": event[4],
-                    "event_type": event[5],
-                    "weight": event[6],
-                    "location": event[7],
-                    "official_url": event[8],
-                    "ctftime_url": event[9],
-                    "invite_link": event[10] if len(event) >= 12 else "",
-                    "added_time": event[11] if len(event) >= 12 else event[10],
-                    "added_by": event[12] if len(event) >= 13 else None,
-                }
-            return None
-        except Exception as e:
-            print(f"Error getting event: {e}")
-            return None
-        finally:
-            conn.close()
+                if event:
+                    return _event_from_row(event)
+                return None
+            except Exception as e:
+                print(f"Error getting event: {e}")
+                return None
 
     def get_all_events(self, guild_id: str):
         """Get all events for a guild"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                "SELECT * FROM ctf_events WHERE guild_id = ? ORDER BY start_time",
-                (guild_id,),
-            )
-            events = c.fetchall()
+            try:
+                c.execute(
+                    f"SELECT {EVENT_COLUMNS} FROM ctf_events e WHERE guild_id = ? ORDER BY start_epoch",
+                    (guild_id,),
+                )
+                events = c.fetchall()
 
-            return [
-                {
-                    "event_id": event[0],
-                    "guild_id": event[1],
-                    "name": event[2],
-                    "start_time": event[3],
-                    "end_time": event[4],
-                    "event_type": event[5],
-                    "weight": event[6],
-                    "location": event[7],
-                    "official_url": event[8],
-                    "ctftime_url": event[9],
-                    "invite_link": event[10] if len(event) >= 12 else "",
-                    "added_time": event[11] if len(event) >= 12 else event[10],
-                    "added_by": event[12] if len(event) >= 13 else None,
-                }
-                for event in events
-            ]
-        except Exception as e:
-            print(f"Error getting all events: {e}")
-            return []
-        finally:
-            conn.close()
+                return [_event_from_row(event) for event in events]
+            except Exception as e:
+                print(f"Error getting all events: {e}")
+                return []
+
+    def get_ended_events(self, now_epoch: int) -> list:
+        """Get events in every guild that ended at or before the given time"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    f"SELECT {EVENT_COLUMNS} FROM ctf_events e WHERE end_epoch <= ?",
+                    (now_epoch,),
+                )
+                return [_event_from_row(event) for event in c.fetchall()]
+            except Exception as e:
+                print(f"Error getting ended events: {e}")
+                return []
+
+    def get_next_end_epoch(self, now_epoch: int) -> Optional[int]:
+        """Get the earliest end time after the given time, or None if there is none"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    "SELECT MIN(end_epoch) FROM ctf_events WHERE end_epoch > ?",
+                    (now_epoch,),
+                )
+                result = c.fetchone()
+                return result[0] if result else None
+            except Exception as e:
+                print(f"Error getting next end time: {e}")
+                return None
+
+    def get_events_without_role(self) -> list:
+        """Get events in every guild that have no role ID stored"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    f"SELECT {EVENT_COLUMNS} FROM ctf_events e WHERE role_id IS NULL"
+                )
+                return [_event_from_row(event) for event in c.fetchall()]
+            except Exception as e:
+                print(f"Error getting events without role: {e}")
+                return []
+
+    def set_event_role(self, event_id: str, guild_id: str, role_id: str) -> bool:
+        """Store the Discord role ID created for an event"""
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    UPDATE ctf_events SET role_id = ?
+                    WHERE event_id = ? AND guild_id = ?
+                    """,
+                    (role_id, event_id, guild_id),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error setting event role: {e}")
+                return False
 
     def delete_event(self, event_id: str, guild_id: str):
         """Delete event by ID"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                "DELETE FROM ctf_events WHERE event_id = ? AND guild_id = ?",
-                (event_id, guild_id),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error deleting event: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    "DELETE FROM ctf_events WHERE event_id = ? AND guild_id = ?",
+                    (event_id, guild_id),
+                )
+                c.execute(
+                    "DELETE FROM reminder_outbox WHERE event_id = ? AND guild_id = ?",
+                    (event_id, guild_id),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error deleting event: {e}")
+                return False
 
     def set_user_timezone(self, user_id: str, guild_id: str, timezone: str) -> bool:
         """Set user timezone setting"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                INSERT OR REPLACE INTO user_timezones 
-                (user_id, guild_id, timezone, updated_time)
-                VALUES (?, ?, ?, ?)
-            """,
-                (user_id, guild_id, timezone, datetime.now().isoformat()),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error setting user timezone: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    """
+                    INSERT OR REPLACE INTO user_timezones 
+                    (user_id, guild_id, timezone, updated_time)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    (user_id, guild_id, timezone, datetime.now().isoformat()),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error setting user timezone: {e}")
+                return False
 
     def get_user_timezone(self, user_id: str, guild_id: str) -> str:
         """Get user timezone setting"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        c.execute(
-            "SELECT timezone FROM user_timezones WHERE user_id = ? AND guild_id = ?",
-            (user_id, guild_id),
-        )
-        result = c.fetchone()
-
-        conn.close()
+            c.execute(
+                "SELECT timezone FROM user_timezones WHERE user_id = ? AND guild_id = ?",
+                (user_id, guild_id),
+            )
+            result = c.fetchone()
 
-        return result[0] if result else "UTC"
+            return result[0] if result else "UTC"
 
     def set_event_invite_link(
         self, event_id: str, guild_id: str, invite_link: str
     ) -> bool:
         """Set invite link for an event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            # Ensure invite_link is not None
-            invite_link = invite_link or ""
+            try:
+                # Ensure invite_link is not None
+                invite_link = invite_link or ""
 
-            c.execute(
-                """
-                UPDATE ctf_events 
-                SET invite_link = ? 
-                WHERE event_id = ? AND guild_id = ?
-                """,
-                (invite_link, event_id, guild_id),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error setting invite link: {e}")
-            return False
-        finally:
-            conn.close()
+                c.execute(
+                    """
+                    UPDATE ctf_events 
+                    SET invite_link = ? 
+                    WHERE event_id = ? AND guild_id = ?
+                    """,
+                    (invite_link, event_id, guild_id),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error setting invite link: {e}")
+                return False
 
     def is_user_joined(self, event_id: str, guild_id: str, user_id: str) -> bool:
         """Check if user has already joined an event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                SELECT 1 FROM event_participants 
-                WHERE event_id = ? AND guild_id = ? AND user_id = ?
-                """,
-                (event_id, guild_id, user_id),
-            )
-            return bool(c.fetchone())
-        except Exception as e:
-            print(f"Error checking user join status: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    """
+                    SELECT 1 FROM event_participants 
+                    WHERE event_id = ? AND guild_id = ? AND user_id = ?
+                    """,
+                    (event_id, guild_id, user_id),
+                )
+                return bool(c.fetchone())
+            except Exception as e:
+                print(f"Error checking user join status: {e}")
+                return False
 
     def set_notification_channel(self, guild_id: str, channel_id: str) -> bool:
         """Set notification channel for a guild"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                INSERT OR REPLACE INTO guild_settings (guild_id, notification_channel_id)
-                VALUES (?, ?)
-                """,
-                (guild_id, channel_id),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error setting notification channel: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    """
+                    INSERT OR REPLACE INTO guild_settings (guild_id, notification_channel_id)
+                    VALUES (?, ?)
+                    """,
+                    (guild_id, channel_id),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error setting notification channel: {e}")
+                return False
 
     def get_notification_channel(self, guild_id: str) -> str:
         """Get notification channel ID for a guild"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                "SELECT notification_channel_id FROM guild_settings WHERE guild_id = ?",
-                (guild_id,),
-            )
-            result = c.fetchone()
-            return result[0] if result else None
-        except Exception as e:
-            print(f"Error getting notification channel: {e}")
-            return None
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    "SELECT notification_channel_id FROM guild_settings WHERE guild_id = ?",
+                    (guild_id,),
+                )
+                result = c.fetchone()
+                return result[0] if result else None
+            except Exception as e:
+                print(f"Error getting notification channel: {e}")
+                return None
 
     def set_ctftime_team_id(self, guild_id: str, team_id: str) -> bool:
         """Set CTFtime team ID for a guild"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                UPDATE guild_settings 
-                SET ctftime_team_id = ? 
-                WHERE guild_id = ?
-                """,
-                (team_id, guild_id),
-            )
-            if c.rowcount == 0:
-                # If no row was updated, insert a new one
+            try:
                 c.execute(
                     """
-                    INSERT INTO guild_settings (guild_id, ctftime_team_id)
-                    VALUES (?, ?)
+                    UPDATE guild_settings 
+                    SET ctftime_team_id = ? 
+                    WHERE guild_id = ?
                     """,
-                    (guild_id, team_id),
+                    (team_id, guild_id),
                 )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error setting CTFtime team ID: {e}")
-            return False
-        finally:
-            conn.close()
+                if c.rowcount == 0:
+                    # If no row was updated, insert a new one
+                    c.execute(
+                        """
+                        INSERT INTO guild_settings (guild_id, ctftime_team_id)
+                        VALUES (?, ?)
+                        """,
+                        (guild_id, team_id),
+                    )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error setting CTFtime team ID: {e}")
+                return False
 
     def get_ctftime_team_id(self, guild_id: str) -> str:
         """Get CTFtime team ID for a guild"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                "SELECT ctftime_team_id FROM guild_settings WHERE guild_id = ?",
-                (guild_id,),
-            )
-            result = c.fetchone()
-            return result[0] if result else None
-        except Exception as e:
-            print(f"Error getting CTFtime team ID: {e}")
-            return None
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    "SELECT ctftime_team_id FROM guild_settings WHERE guild_id = ?",
+                    (guild_id,),
+                )
+                result = c.fetchone()
+                return result[0] if result else None
+            except Exception as e:
+                print(f"Error getting CTFtime team ID: {e}")
+                return None
+
+    def get_team_subscriptions(self) -> list:
+        """Get every guild that tracks a CTFtime team, with its notification channel"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    SELECT guild_id, ctftime_team_id, notification_channel_id
+                    FROM guild_settings
+                    WHERE ctftime_team_id IS NOT NULL AND ctftime_team_id != ''
+                    """
+                )
+                return [
+                    {"guild_id": row[0], "team_id": row[1], "channel_id": row[2]}
+                    for row in c.fetchall()
+                ]
+            except Exception as e:
+                print(f"Error getting team subscriptions: {e}")
+                return []
+
+    def get_team_poll_states(self) -> dict:
+        """Get the polling state of every team, keyed by team ID"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    SELECT team_id, guild_ids, etag, last_modified, digest,
+                           poll_interval, next_poll_epoch
+                    FROM team_poll_state
+                    """
+                )
+                return {
+                    row[0]: {
+                        "guild_ids": row[1],
+                        "etag": row[2],
+                        "last_modified": row[3],
+                        "digest": row[4],
+                        "poll_interval": row[5],
+                        "next_poll_epoch": row[6],
+                    }
+                    for row in c.fetchall()
+                }
+            except Exception as e:
+                print(f"Error getting team poll states: {e}")
+                return {}
+
+    def set_team_poll_state(
+        self,
+        team_id: str,
+        guild_ids: str,
+        etag: str,
+        last_modified: str,
+        digest: str,
+        poll_interval: int,
+        next_poll_epoch: int,
+    ) -> bool:
+        """Save when a team is next polled and the team page version last seen"""
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    INSERT OR REPLACE INTO team_poll_state
+                    (team_id, guild_ids, etag, last_modified, digest,
+                     poll_interval, next_poll_epoch)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        team_id,
+                        guild_ids,
+                        etag,
+                        last_modified,
+                        digest,
+                        poll_interval,
+                        next_poll_epoch,
+                    ),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error setting team poll state: {e}")
+                return False
 
     def set_reminder_settings(
         self,
@@ -577,64 +927,383 @@ class Database:
         before_end: str,
     ) -> bool:
         """Set reminder settings for a user in an event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.writer() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                INSERT OR REPLACE INTO reminder_settings (event_id, guild_id, user_id, before_start, before_end)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (event_id, guild_id, user_id, before_start, before_end),
-            )
-            conn.commit()
-            return True
-        except Exception as e:
-            print(f"Error setting reminder settings: {e}")
-            return False
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    """
+                    INSERT OR REPLACE INTO reminder_settings (event_id, guild_id, user_id, before_start, before_end)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (event_id, guild_id, user_id, before_start, before_end),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error setting reminder settings: {e}")
+                return False
 
     def get_reminder_settings(
         self, event_id: str, guild_id: str, user_id: str
     ) -> tuple:
         """Get reminder settings for a user in an event"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                SELECT before_start, before_end FROM reminder_settings 
-                WHERE event_id = ? AND guild_id = ? AND user_id = ?
-                """,
-                (event_id, guild_id, user_id),
-            )
-            result = c.fetchone()
-            return result if result else (None, None)
-        except Exception as e:
-            print(f"Error getting reminder settings: {e}")
-            return None, None
-        finally:
-            conn.close()
+            try:
+                c.execute(
+                    """
+                    SELECT before_start, before_end FROM reminder_settings 
+                    WHERE event_id = ? AND guild_id = ? AND user_id = ?
+                    """,
+                    (event_id, guild_id, user_id),
+                )
+                result = c.fetchone()
+                return result if result else (None, None)
+            except Exception as e:
+                print(f"Error getting reminder settings: {e}")
+                return None, None
 
     def get_all_reminder_settings(self) -> list:
         """Get all reminder settings"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
+        with self.pool.reader() as conn:
+            c = conn.cursor()
 
-        try:
-            c.execute(
-                """
-                SELECT rs.*, ce.start_time, ce.end_time, ce.name
-                FROM reminder_settings rs
-                JOIN ctf_events ce ON rs.event_id = ce.event_id AND rs.guild_id = ce.guild_id
-                """
+            try:
+                c.execute(
+                    """
+                    SELECT rs.*, ce.start_time, ce.end_time, ce.name
+                    FROM reminder_settings rs
+                    JOIN ctf_events ce ON rs.event_id = ce.event_id AND rs.guild_id = ce.guild_id
+                    """
+                )
+                return c.fetchall()
+            except Exception as e:
+                print(f"Error getting all reminder settings: {e}")
+                return []
+
+    def get_reminder_candidates(
+        self,
+        now_epoch: int,
+        horizon: int = None,
+        event_id: str = None,
+        guild_id: str = None,
+    ) -> list:
+        """Get participants and reminder settings of unfinished events, optionally filtered"""
+        conditions = ["e.end_epoch > ?"]
+        params = [now_epoch]
+        if horizon is not None:
+            conditions.append("e.start_epoch <= ?")
+            params.append(now_epoch + horizon)
+        if event_id is not None:
+            conditions.append("e.event_id = ? AND e.guild_id = ?")
+            params.extend((event_id, guild_id))
+
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    f"""
+                    SELECT e.guild_id, e.event_id, e.name, e.start_epoch, e.end_epoch,
+                           e.official_url, p.user_id, rs.before_start, rs.before_end
+                    FROM ctf_events e
+                    JOIN event_participants p
+                        ON p.event_id = e.event_id AND p.guild_id = e.guild_id
+                    LEFT JOIN reminder_settings rs
+                        ON rs.event_id = p.event_id AND rs.guild_id = p.guild_id
+                        AND rs.user_id = p.user_id
+                    WHERE {" AND ".join(conditions)}
+                    """,
+                    params,
+                )
+                return [
+                    {
+                        "guild_id": row[0],
+                        "event_id": row[1],
+                        "name": row[2],
+                        "start_epoch": row[3],
+                        "end_epoch": row[4],
+                        "official_url": row[5],
+                        "user_id": row[6],
+                        "before_start": row[7],
+                        "before_end": row[8],
+                    }
+                    for row in c.fetchall()
+                ]
+            except Exception as e:
+                print(f"Error getting reminder candidates: {e}")
+                return []
+
+    def schedule_reminders(
+        self, reminders: list, event_id: str = None, guild_id: str = None
+    ) -> set:
+        """Replace the pending outbox reminders of one event, or of every event.
+
+        reminders holds (event_id, guild_id, user_id, reminder, fire_epoch)
+        tuples. Reminders that were already sent are kept as they are, and
+        their (event_id, guild_id, user_id, reminder) keys are returned so the
+        caller can leave them out of its schedule.
+        """
+        scope = ""
+        params = ()
+        if event_id is not None:
+            scope = " AND event_id = ? AND guild_id = ?"
+            params = (event_id, guild_id)
+
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    f"DELETE FROM reminder_outbox WHERE sent_epoch IS NULL{scope}",
+                    params,
+                )
+                c.executemany(
+                    """
+                    INSERT INTO reminder_outbox
+                    (event_id, guild_id, user_id, reminder, fire_epoch)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (event_id, guild_id, user_id, reminder) DO NOTHING
+                    """,
+                    reminders,
+                )
+                c.execute(
+                    f"""
+                    SELECT event_id, guild_id, user_id, reminder
+                    FROM reminder_outbox
+                    WHERE sent_epoch IS NOT NULL{scope}
+                    """,
+                    params,
+                )
+                sent = set(c.fetchall())
+                conn.commit()
+                return sent
+            except Exception as e:
+                print(f"Error scheduling reminders: {e}")
+                return set()
+
+    def is_reminder_sent(
+        self, event_id: str, guild_id: str, user_id: str, reminder: str
+    ) -> bool:
+        """Check whether an outbox reminder has already been delivered"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    SELECT 1 FROM reminder_outbox
+                    WHERE event_id = ? AND guild_id = ? AND user_id = ? AND reminder = ?
+                    AND sent_epoch IS NOT NULL
+                    """,
+                    (event_id, guild_id, user_id, reminder),
+                )
+                return c.fetchone() is not None
+            except Exception as e:
+                print(f"Error checking reminder: {e}")
+                return False
+
+    def mark_reminder_sent(
+        self, event_id: str, guild_id: str, user_id: str, reminder: str
+    ) -> bool:
+        """Mark an outbox reminder as delivered"""
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    UPDATE reminder_outbox
+                    SET sent_epoch = ?
+                    WHERE event_id = ? AND guild_id = ? AND user_id = ? AND reminder = ?
+                    """,
+                    (
+                        int(datetime.now(timezone.utc).timestamp()),
+                        event_id,
+                        guild_id,
+                        user_id,
+                        reminder,
+                    ),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error marking reminder sent: {e}")
+                return False
+
+    def get_cached_event(self, event_id: str) -> dict:
+        """Get cached CTFtime event details, their expiry time and validators"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    SELECT data, expires_epoch, etag, last_modified
+                    FROM ctftime_event_cache
+                    WHERE event_id = ?
+                    """,
+                    (event_id,),
+                )
+                result = c.fetchone()
+                if not result:
+                    return None
+                return {
+                    "data": result[0],
+                    "expires_epoch": result[1],
+                    "etag": result[2],
+                    "last_modified": result[3],
+                }
+            except Exception as e:
+                print(f"Error getting cached event: {e}")
+                return None
+
+    def cache_event(
+        self,
+        event_id: str,
+        data: str,
+        expires_epoch: int,
+        etag: str = None,
+        last_modified: str = None,
+    ) -> bool:
+        """Store CTFtime event details in the persistent cache"""
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    INSERT OR REPLACE INTO ctftime_event_cache
+                    (event_id, data, expires_epoch, etag, last_modified)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (event_id, data, expires_epoch, etag, last_modified),
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error caching event: {e}")
+                return False
+
+    def replace_mirror_window(
+        self, start_epoch: int, finish_epoch: int, events: list
+    ) -> bool:
+        """Replace mirrored events starting in a window with (event_id, data, start_epoch, finish_epoch) rows"""
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    DELETE FROM ctftime_mirror
+                    WHERE start_epoch >= ? AND start_epoch < ?
+                    """,
+                    (start_epoch, finish_epoch),
+                )
+                c.executemany(
+                    """
+                    INSERT OR REPLACE INTO ctftime_mirror
+                    (event_id, data, start_epoch, finish_epoch)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    events,
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error replacing mirror window: {e}")
+                return False
+
+    def delete_finished_mirror_events(self, now_epoch: int) -> bool:
+        """Drop mirrored events that have finished"""
+        with self.pool.writer() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    "DELETE FROM ctftime_mirror WHERE finish_epoch <= ?", (now_epoch,)
+                )
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error deleting finished mirror events: {e}")
+                return False
+
+    def get_mirrored_event(self, event_id: str) -> str:
+        """Get the raw CTFtime data of a mirrored event"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    "SELECT data FROM ctftime_mirror WHERE event_id = ?", (event_id,)
+                )
+                result = c.fetchone()
+                return result[0] if result else None
+            except Exception as e:
+                print(f"Error getting mirrored event: {e}")
+                return None
+
+    def get_mirrored_events(self, now_epoch: int, limit: int) -> list:
+        """Get the raw CTFtime data of mirrored events that have not finished"""
+        with self.pool.reader() as conn:
+            c = conn.cursor()
+
+            try:
+                c.execute(
+                    """
+                    SELECT data FROM ctftime_mirror
+                    WHERE finish_epoch > ?
+                    ORDER BY start_epoch
+                    LIMIT ?
+                    """,
+                    (now_epoch, limit),
+                )
+                return [row[0] for row in c.fetchall()]
+            except Exception as e:
+                print(f"Error getting mirrored events: {e}")
+                return []
+
+
+class AsyncDatabase:
+    """Awaitable facade over Database for use inside coroutines.
+
+    Every Database method is available with the same arguments but must be
+    awaited. Reads run on a small thread pool, writes run on a single thread
+    so they are applied in the order they were issued and never block the
+    event loop.
+    """
+
+    def __init__(self, db: Database, readers: int = READER_POOL_SIZE):
+        self.db = db
+        self._read_executor = ThreadPoolExecutor(
+            max_workers=readers, thread_name_prefix="db-read"
+        )
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="db-write"
+        )
+
+    def __getattr__(self, name):
+        method = getattr(self.db, name)
+        if name.startswith(READ_METHOD_PREFIXES):
+            executor = self._read_executor
+        else:
+            executor = self._write_executor
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, functools.partial(method, *args, **kwargs)
             )
-            return c.fetchall()
-        except Exception as e:
-            print(f"Error getting all reminder settings: {e}")
-            return []
-        finally:
-            conn.close()
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+    def close(self):
+        """Stop the executor threads after pending queries finish"""
+        self._read_executor.shutdown()
+        self._write_executor.shutdown()
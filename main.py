@@ -448,7 +448,7 @@ async def setctftime(ctx, team_id: str = None):
 
         try:
             # Get team's planned events
-            planned_events = get_team_events(team_id)
+            planned_events = await get_team_events(team_id)
             if not planned_events:
                 await loading_msg.edit(
                     content="❌ No planned events found or failed to fetch events."
@@ -563,7 +563,7 @@ async def check_team_events():
                 continue
 
             # Get team's planned events
-            planned_events = get_team_events(team_id)
+            planned_events = await get_team_events(team_id)
             if not planned_events:
                 continue
 
@@ -8,20 +8,54 @@ import discord
 from discord.ext import commands
 from dotenv import find_dotenv, load_dotenv
 
-from database import Database
+import ctftime_api
+from ctf_buttons import JoinButton, LeaveButton
+from database import close_pools, get_async_database
 
 # Load environment variables
 load_dotenv(find_dotenv(), override=True)
 TOKEN = os.getenv("DISCORD_TOKEN")
 
+
+class CTFBot(commands.Bot):
+    """Bot that sets up the shared CTFtime client and persistent buttons"""
+
+    async def setup_hook(self):
+        """Called once before connecting to Discord"""
+        await ctftime_api.open_session()
+        # Buttons on every past announcement are routed by their custom_id
+        self.add_dynamic_items(JoinButton, LeaveButton)
+        ctftime_api.event_cache.store = db
+        ctftime_api.event_mirror.store = db
+        # Read here rather than at import, after .env has been loaded
+        rate = os.getenv("CTFTIME_REQUESTS_PER_SECOND")
+        if rate is not None:
+            try:
+                requests_per_second = float(rate)
+            except ValueError:
+                requests_per_second = 0
+            if requests_per_second > 0:
+                ctftime_api.rate_limiter.rate = requests_per_second
+            else:
+                print(
+                    f"Invalid CTFTIME_REQUESTS_PER_SECOND {rate!r}, "
+                    f"using {ctftime_api.REQUESTS_PER_SECOND}"
+                )
+
+    async def close(self):
+        """Called when the bot shuts down"""
+        await super().close()
+        await ctftime_api.close_session()
+
+
 # Initialize bot
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = CTFBot(command_prefix="!", intents=intents)
 
 # Initialize database
-db = Database()
+db = get_async_database()
 
 
 @bot.event
@@ -48,14 +82,14 @@ async def load_cogs():
 async def on_guild_join(guild):
     """Called when the bot joins a new server"""
     # Create database entries for the new server
-    db.add_guild(str(guild.id))
+    await db.add_guild(str(guild.id))
 
 
 @bot.event
 async def on_guild_remove(guild):
     """Called when the bot is removed from a server"""
     # Clean up database entries for the server
-    db.remove_guild(str(guild.id))
+    await db.remove_guild(str(guild.id))
 
 
 @bot.event
@@ -99,7 +133,10 @@ async def on_command_error(ctx, error):
 
 def main():
     """Main entry point"""
-    bot.run(TOKEN)
+    try:
+        bot.run(TOKEN)
+    finally:
+        close_pools()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+"""
+Lookup helpers for the Discord roles created for CTF events.
+"""
+
+from typing import Optional
+
+import discord
+
+from database import AsyncDatabase
+
+
+def get_event_role(guild: discord.Guild, event: dict) -> Optional[discord.Role]:
+    """Get an event's role by its stored ID, or by name if no ID is stored"""
+    if event.get("role_id"):
+        return guild.get_role(int(event["role_id"]))
+    return discord.utils.get(guild.roles, name=f"CTF-{event['name']}")
+
+
+async def backfill_role_ids(bot: discord.Client, db: AsyncDatabase) -> int:
+    """Store role IDs for events created before they were recorded, returning how many were filled"""
+    filled = 0
+    for event in await db.get_events_without_role():
+        guild = bot.get_guild(int(event["guild_id"]))
+        if not guild:
+            continue
+
+        role = get_event_role(guild, event)
+        if role and await db.set_event_role(
+            event["event_id"], event["guild_id"], str(role.id)
+        ):
+            filled += 1
+    return filled
@@ -0,0 +1,237 @@
+"""
+In-process schedulers that keep upcoming fire times in memory.
+Entries are identified by a key and may belong to a group, so everything
+scheduled for one event can be cancelled at once.
+"""
+
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Hashable, List, Optional, Tuple
+
+
+class Scheduler(ABC):
+    """Base class tracking keys and groups for a scheduler backend."""
+
+    def __init__(self):
+        self._groups = {}  # group -> set of keys
+        self._key_groups = {}  # key -> group
+
+    def schedule(
+        self,
+        key: Hashable,
+        fire_epoch: int,
+        payload: Any = None,
+        group: Hashable = None,
+    ):
+        """Schedule (or reschedule) key to fire at fire_epoch"""
+        self.cancel(key)
+        self._insert(key, fire_epoch, payload)
+        self._key_groups[key] = group
+        self._groups.setdefault(group, set()).add(key)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a scheduled key, returning False if it was not scheduled"""
+        if key not in self._key_groups:
+            return False
+        self._remove(key)
+        self._forget(key)
+        return True
+
+    def cancel_group(self, group: Hashable):
+        """Cancel every key scheduled in group"""
+        for key in list(self._groups.get(group, ())):
+            self.cancel(key)
+
+    def pop_due(self, now_epoch: int) -> List[Tuple[Hashable, int, Any]]:
+        """Remove and return (key, fire_epoch, payload) for every due entry"""
+        due = self._pop_due(now_epoch)
+        for key, _, _ in due:
+            self._forget(key)
+        return due
+
+    @abstractmethod
+    def next_fire(self) -> Optional[int]:
+        """Get the earliest scheduled fire time, or None if nothing is scheduled"""
+
+    def __len__(self) -> int:
+        return len(self._key_groups)
+
+    def _forget(self, key: Hashable):
+        group = self._key_groups.pop(key)
+        keys = self._groups[group]
+        keys.discard(key)
+        if not keys:
+            del self._groups[group]
+
+    @abstractmethod
+    def _insert(self, key: Hashable, fire_epoch: int, payload: Any):
+        """Add an entry for a key that is not scheduled"""
+
+    @abstractmethod
+    def _remove(self, key: Hashable):
+        """Drop the entry for a scheduled key"""
+
+    @abstractmethod
+    def _pop_due(self, now_epoch: int) -> List[Tuple[Hashable, int, Any]]:
+        """Remove and return the entries due at now_epoch"""
+
+
+class HeapScheduler(Scheduler):
+    """Min-heap of fire times with lazy cancellation."""
+
+    def __init__(self):
+        super().__init__()
+        self._heap = []
+        self._entries = {}  # key -> [fire_epoch, seq, key, payload, active]
+        self._counter = itertools.count()
+        self._cancelled = 0
+
+    def next_fire(self) -> Optional[int]:
+        self._discard_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def _insert(self, key: Hashable, fire_epoch: int, payload: Any):
+        # The sequence number keeps equal fire times from comparing keys
+        entry = [fire_epoch, next(self._counter), key, payload, True]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def _remove(self, key: Hashable):
+        self._entries.pop(key)[4] = False
+        self._cancelled += 1
+        # Rebuild once cancelled entries outnumber live ones
+        if self._cancelled > len(self._entries):
+            self._heap = [entry for entry in self._heap if entry[4]]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _pop_due(self, now_epoch: int) -> List[Tuple[Hashable, int, Any]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now_epoch:
+            fire_epoch, _, key, payload, active = heapq.heappop(self._heap)
+            if active:
+                del self._entries[key]
+                due.append((key, fire_epoch, payload))
+            else:
+                self._cancelled -= 1
+        return due
+
+    def _discard_cancelled(self):
+        while self._heap and not self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+
+class TimingWheelScheduler(Scheduler):
+    """Hierarchical timing wheel with minute slots and O(1) schedule/cancel.
+
+    Level 0 holds the current hour in minute slots, level 1 the current day in
+    hour slots and level 2 the next 512 days in day slots; anything further
+    out waits in an overflow bucket. Entries cascade down a level whenever the
+    wheel below wraps around.
+    """
+
+    TICK = 60  # Seconds per level 0 slot
+    LEVEL_SLOTS = (60, 24, 512)
+
+    def __init__(self, now_epoch: Optional[int] = None):
+        super().__init__()
+        if now_epoch is None:
+            now_epoch = int(time.time())
+        self._tick = now_epoch // self.TICK
+        self._spans = []  # Ticks covered by one slot on each level
+        span = 1
+        for slots in self.LEVEL_SLOTS:
+            self._spans.append(span)
+            span *= slots
+        self._horizon = span  # Ticks covered by the whole wheel
+        self._levels = [[{} for _ in range(slots)] for slots in self.LEVEL_SLOTS]
+        self._layout = [
+            (wheel, span, slots, span * slots)
+            for wheel, span, slots in zip(self._levels, self._spans, self.LEVEL_SLOTS)
+        ]
+        self._overflow = {}
+        self._entries = {}  # key -> [fire_epoch, key, payload, slot]
+
+    def next_fire(self) -> Optional[int]:
+        """Get the earliest fire time, or None if nothing is scheduled.
+
+        Beyond the current hour only the start of the earliest occupied slot
+        is known, so the result may be early; callers check again once it
+        passes.
+        """
+        if not self._entries:
+            return None
+
+        for level, (slots, span) in enumerate(zip(self.LEVEL_SLOTS, self._spans)):
+            start = self._tick // span
+            # Only slots up to the end of the enclosing slot one level up
+            end = (start // slots + 1) * slots
+            for index in range(start, end):
+                slot = self._levels[level][index % slots]
+                if not slot:
+                    continue
+                if level == 0:
+                    return min(entry[0] for entry in slot.values())
+                return index * span * self.TICK
+
+        return (self._tick // self._horizon + 1) * self._horizon * self.TICK
+
+    def _insert(self, key: Hashable, fire_epoch: int, payload: Any):
+        entry = [fire_epoch, key, payload, None]
+        self._entries[key] = entry
+        self._place(entry)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        del entry[3][key]
+
+    def _pop_due(self, now_epoch: int) -> List[Tuple[Hashable, int, Any]]:
+        target = now_epoch // self.TICK
+        if not self._entries:
+            self._tick = max(self._tick, target)
+            return []
+
+        due = []
+        while True:
+            slot = self._levels[0][self._tick % self.LEVEL_SLOTS[0]]
+            for key, entry in list(slot.items()):
+                if entry[0] <= now_epoch:
+                    del slot[key]
+                    del self._entries[key]
+                    due.append((key, entry[0], entry[2]))
+            if self._tick >= target:
+                return due
+            self._advance()
+
+    def _place(self, entry: list):
+        """Put an entry in the slot matching its distance from the current tick"""
+        tick = max(entry[0] // self.TICK, self._tick)
+        for wheel, span, slots, width in self._layout:
+            # Same enclosing slot one level up means it belongs on this level
+            if tick // width == self._tick // width:
+                slot = wheel[(tick // span) % slots]
+                break
+        else:
+            slot = self._overflow
+        slot[entry[1]] = entry
+        entry[3] = slot
+
+    def _advance(self):
+        """Move to the next tick, cascading slots from the levels above"""
+        self._tick += 1
+        if self._tick % self._horizon == 0:
+            self._cascade(self._overflow)
+        for level in range(len(self.LEVEL_SLOTS) - 1, 0, -1):
+            span = self._spans[level]
+            if self._tick % span == 0:
+                slots = self.LEVEL_SLOTS[level]
+                self._cascade(self._levels[level][(self._tick // span) % slots])
+
+    def _cascade(self, slot: dict):
+        entries = list(slot.values())
+        slot.clear()
+        for entry in entries:
+            self._place(entry)
@@ -0,0 +1,71 @@
+"""
+Query plan checks for the hot database lookups.
+Each lookup is run against a freshly migrated database and its SQL is fed
+back through EXPLAIN QUERY PLAN; a full table scan fails the test.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from database import Database, close_pools
+
+
+class QueryPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, "ctf_events.db"))
+        self.statements = []
+        for conn in list(self.db.pool._readers.queue):
+            conn.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        close_pools()
+        self.tmpdir.cleanup()
+
+    def assert_no_scan(self, lookup, *args, **kwargs):
+        """Run a lookup and check that none of its queries scans a table"""
+        self.statements.clear()
+        lookup(*args, **kwargs)
+        queries = [s for s in self.statements if s.lstrip().upper().startswith("SELECT")]
+        self.assertTrue(queries, f"{lookup.__name__} ran no query")
+
+        with self.db.pool.reader() as conn:
+            conn.set_trace_callback(None)
+            for query in queries:
+                plan = [
+                    row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}")
+                ]
+                scans = [line for line in plan if line.startswith("SCAN")]
+                self.assertFalse(
+                    scans, f"{lookup.__name__} scans a table: {plan}\n{query}"
+                )
+            conn.set_trace_callback(self.statements.append)
+
+    def test_get_user_events(self):
+        self.assert_no_scan(self.db.get_user_events, "1", "2")
+
+    def test_get_event_participants(self):
+        self.assert_no_scan(self.db.get_event_participants, "1", "2")
+
+    def test_get_all_events(self):
+        self.assert_no_scan(self.db.get_all_events, "1")
+
+    def test_get_ended_events(self):
+        self.assert_no_scan(self.db.get_ended_events, int(time.time()))
+
+    def test_get_next_end_epoch(self):
+        self.assert_no_scan(self.db.get_next_end_epoch, int(time.time()))
+
+    def test_get_reminder_candidates(self):
+        now = int(time.time())
+        self.assert_no_scan(self.db.get_reminder_candidates, now)
+        self.assert_no_scan(self.db.get_reminder_candidates, now, horizon=3600)
+        self.assert_no_scan(
+            self.db.get_reminder_candidates, now, event_id="1", guild_id="2"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
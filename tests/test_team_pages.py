@@ -0,0 +1,64 @@
+"""
+Parser checks against saved CTFtime team pages.
+The lxml fast path must return exactly what the html.parser fallback does.
+"""
+
+import os
+import unittest
+
+import ctftime_api
+from ctftime_api import (
+    _parse_team_events,
+    _parse_team_events_lxml,
+    _parse_team_events_soup,
+    _table_section,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "team_pages")
+
+# Fixture page -> number of planned events in its first table
+PLANNED_EVENTS = {
+    "team_small.html": 3,
+    "team_large.html": 25,
+    "team_no_plans.html": 0,
+}
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class TeamPageParseTest(unittest.TestCase):
+    def test_fallback_finds_planned_events(self):
+        for name, count in PLANNED_EVENTS.items():
+            with self.subTest(name):
+                events = _parse_team_events_soup(load_fixture(name))
+                self.assertEqual(len(events), count)
+                for event in events:
+                    self.assertTrue(event["id"].isdigit())
+                    self.assertEqual(
+                        event["url"], f"{ctftime_api.BASE_URL}/event/{event['id']}"
+                    )
+
+    @unittest.skipIf(ctftime_api.lxml_html is None, "lxml is not installed")
+    def test_lxml_matches_fallback(self):
+        for name in PLANNED_EVENTS:
+            with self.subTest(name):
+                html = load_fixture(name)
+                self.assertEqual(
+                    _parse_team_events_lxml(_table_section(html)),
+                    _parse_team_events_soup(html),
+                )
+
+    def test_parse_team_events_matches_fallback(self):
+        for name in PLANNED_EVENTS:
+            with self.subTest(name):
+                html = load_fixture(name)
+                self.assertEqual(
+                    _parse_team_events(html, name), _parse_team_events_soup(html)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()